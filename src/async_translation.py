@@ -0,0 +1,209 @@
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+# Maximum number of characters per request accepted by LibreTranslate-like backends
+DEFAULT_CHAR_LIMIT = 5000
+
+# Source languages of a stock LibreTranslate install, used when /languages cannot be read
+LIBRETRANSLATE_LANGUAGES = frozenset(
+    "ar az bg bn ca cs da de el en eo es et fa fi fr ga he hi hu id it ja ko lt lv ms nb nl "
+    "pl pt ro ru sk sl sq sv th tl tr uk ur zh".split()
+)
+
+# HTTP statuses meaning "slow down" or "try again later"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Asyncio token bucket: `rate` tokens are added per second up to `capacity`,
+    each request takes one token and waits while the bucket is empty.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+
+def pack_texts(texts: List[str], char_limit: int = DEFAULT_CHAR_LIMIT) -> List[List[int]]:
+    """
+    Greedily pack texts (as positions) into batches whose total length stays under
+    char_limit. A text longer than the limit is sent alone.
+    """
+    batches, current, size = [], [], 0
+    for i, text in enumerate(texts):
+        if current and size + len(text) > char_limit:
+            batches.append(current)
+            current, size = [], 0
+        current.append(i)
+        size += len(text)
+    if current:
+        batches.append(current)
+    return batches
+
+
+class TranslationError(Exception):
+    def __init__(self, message: str, retry: bool = False, retry_after: float = None):
+        super().__init__(message)
+        self.retry = retry
+        self.retry_after = retry_after
+
+
+class AsyncTranslationClient:
+    """
+    Asynchronous client of a LibreTranslate-compatible endpoint
+    (POST {"q": [texts], "source", "target", "format"} -> {"translatedText": [texts]}).
+
+    Short texts sharing a source language are packed into one request up to
+    char_limit characters, requests are paced by a token bucket (rate requests per
+    second, bursts of burst) with at most max_concurrency in flight, and throttled
+    or failed requests are retried with exponential backoff and jitter, honouring
+    Retry-After when the server sends it.
+
+    Source languages the endpoint does not support (read once from its /languages
+    route, LIBRETRANSLATE_LANGUAGES when it has none) are sent as "auto", the server
+    would reject them otherwise.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        rate: float = 5.0,
+        burst: float = None,
+        char_limit: int = DEFAULT_CHAR_LIMIT,
+        max_concurrency: int = 8,
+        max_retries: int = 5,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        timeout: float = 30.0,
+        api_key: str = None
+    ):
+        self.url = url
+        self.rate = rate
+        self.burst = burst
+        self.char_limit = char_limit
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.api_key = api_key
+        self.languages = None
+        self.requests = 0
+        self.retries = 0
+
+    async def _post(self, client, bucket: TokenBucket, texts: List[str], source: str, target: str) -> List[str]:
+        import httpx
+
+        await bucket.acquire()
+        self.requests += 1
+        payload = {"q": texts, "source": source, "target": target, "format": "text"}
+        if self.api_key:
+            payload["api_key"] = self.api_key
+        try:
+            response = await client.post(self.url, json=payload)
+        except httpx.TransportError as e:
+            raise TranslationError(f"{type(e).__name__}: {e}", retry=True)
+
+        if response.status_code in RETRY_STATUSES:
+            try:
+                retry_after = float(response.headers.get("Retry-After"))
+            except (TypeError, ValueError):
+                retry_after = None
+            raise TranslationError(f"HTTP {response.status_code}", retry=True, retry_after=retry_after)
+        if response.status_code != 200:
+            raise TranslationError(f"HTTP {response.status_code}: {response.text[:200]}")
+
+        translations = response.json().get("translatedText")
+        if isinstance(translations, str):
+            translations = [translations]
+        if not isinstance(translations, list) or len(translations) != len(texts):
+            raise TranslationError("Malformed response: translatedText does not match the request")
+        return translations
+
+    async def _supported_languages(self, client) -> frozenset:
+        """Source languages accepted by the endpoint, read from its /languages route."""
+        if self.languages is None:
+            try:
+                response = await client.get(f"{self.url.rsplit('/', 1)[0]}/languages")
+                response.raise_for_status()
+                self.languages = frozenset(language["code"] for language in response.json())
+            except Exception:
+                self.languages = LIBRETRANSLATE_LANGUAGES
+        return self.languages
+
+    async def _translate_batch(
+        self, client, bucket: TokenBucket, semaphore: asyncio.Semaphore, texts: List[str], source: str, target: str
+    ) -> List[Tuple[Optional[str], Optional[str]]]:
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with semaphore:
+                    translations = await self._post(client, bucket, texts, source, target)
+                return [(translation, None) for translation in translations]
+            except TranslationError as e:
+                if not e.retry or attempt == self.max_retries:
+                    return [(None, str(e))] * len(texts)
+                self.retries += 1
+                delay = min(self.max_backoff, self.backoff * 2 ** attempt) * random.uniform(0.5, 1.5)
+                await asyncio.sleep(max(delay, e.retry_after or 0.0))
+
+    async def translate_many_async(
+        self, texts: List[str], sources: List[str] = None, target: str = "en"
+    ) -> List[Tuple[Optional[str], Optional[str]]]:
+        """Translate texts, returning one (translation, None) or (None, error) per text, in order."""
+        import httpx
+
+        sources = sources or ["auto"] * len(texts)
+        bucket = TokenBucket(self.rate, self.burst)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = [(None, None)] * len(texts)
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            languages = await self._supported_languages(client)
+            by_source = {}
+            for i, source in enumerate(sources):
+                by_source.setdefault(source if source in languages else "auto", []).append(i)
+
+            jobs = []
+            for source, positions in by_source.items():
+                for batch in pack_texts([texts[i] for i in positions], self.char_limit):
+                    jobs.append((source, [positions[j] for j in batch]))
+
+            batch_results = await asyncio.gather(*[
+                self._translate_batch(client, bucket, semaphore, [texts[i] for i in positions], source, target)
+                for source, positions in jobs
+            ])
+        for (_, positions), batch_result in zip(jobs, batch_results):
+            for i, result in zip(positions, batch_result):
+                results[i] = result
+        return results
+
+    def translate_many(
+        self, texts: List[str], sources: List[str] = None, target: str = "en"
+    ) -> List[Tuple[Optional[str], Optional[str]]]:
+        """
+        Blocking wrapper of `translate_many_async`. Inside a running event loop (e.g. a
+        Jupyter notebook) the coroutine runs on its own loop in a worker thread.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.translate_many_async(texts, sources, target))
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.translate_many_async(texts, sources, target)).result()
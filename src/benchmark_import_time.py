@@ -0,0 +1,88 @@
+import argparse
+import logging
+import os
+import subprocess
+import sys
+
+logger = logging.getLogger(__name__)
+
+# Pipeline modules that must stay cheap to import: models and heavy libraries load on first use
+MODULES = [
+    "keyword_matcher",
+    "disk_cache",
+    "lemma_cache",
+    "translation_cache",
+    "spelling_correction",
+    "near_duplicates",
+    "pipeline_checkpoint",
+    "pipeline_extraction_keywords",
+    "pipeline_anomalies_processing",
+]
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def measure_import_time(module: str, repeat: int = 5) -> float:
+    """
+    Import a module in fresh interpreters and return the best wall time in seconds.
+    Each run is a new process, so nothing is served from an already warm sys.modules.
+    """
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"import {module}; print(time.perf_counter() - start)"
+    )
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=SRC_DIR,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return min(timings)
+
+
+def run_benchmark(modules: list, budget: float, repeat: int) -> bool:
+    """Log the import time of every module and return False if one exceeds the budget."""
+    within_budget = True
+    for module in modules:
+        elapsed = measure_import_time(module, repeat)
+        status = "OK" if elapsed <= budget else "TOO SLOW"
+        logger.info(f"{module}: {elapsed * 1000:.0f} ms ({status}, budget {budget * 1000:.0f} ms)")
+        within_budget = within_budget and elapsed <= budget
+    return within_budget
+
+
+if __name__ == "__main__":
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    parser = argparse.ArgumentParser(prog="benchmark_import_time.py",
+                                     description="Measure the import time of the pipeline modules",
+                                     epilog="Exemple : python benchmark_import_time.py --budget 0.5")
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=0.5,
+        help="Maximum import time allowed per module, in seconds."
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Number of fresh interpreters per module, the best time is kept."
+    )
+    parser.add_argument(
+        "--modules",
+        nargs="+",
+        default=MODULES,
+        help="Modules to import."
+    )
+    args = parser.parse_args()
+
+    sys.exit(0 if run_benchmark(args.modules, args.budget, args.repeat) else 1)
@@ -0,0 +1,391 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import numpy as np
+import polars as pl
+
+logger = logging.getLogger(__name__)
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Labelled reviews whose keyword, length and vocabulary distributions shape the synthetic corpus
+REFERENCE_DATASET = "../notebooks/pipelines/merged_final_dataset.csv"
+# Share of the raw reviews matching each category and exclusion category. The labelled set
+# was sampled among matching reviews, so its rates are far higher than in the real input
+RATES_PATH = "../data/benchmark_rates.json"
+CORPUS_DIR = "../data/cache/benchmark"
+
+SIZES = [10_000, 100_000, 1_000_000]
+STAGES = ["remove_stopwords", "lemmatize_column_fast", "extract_all_categories", "process_pipeline"]
+
+# Filler words drawn from the most frequent words of the reference reviews
+VOCABULARY_SIZE = 5000
+
+
+def read_reviews(csv_path: str, column_name: str = "review") -> List[str]:
+    """Non-null reviews of a CSV file."""
+    return [r for r in pl.read_csv(csv_path)[column_name].to_list() if isinstance(r, str)]
+
+
+def match_counts(reviews: List[str], phrases: Dict[str, List[str]]) -> Tuple[Counter, Dict[str, Counter]]:
+    """Number of reviews matching each category, and number of matches of each phrase."""
+    from keyword_matcher import KeywordMatcher
+
+    matcher = KeywordMatcher(phrases)
+    hits = Counter()
+    counts = {category: Counter() for category in phrases}
+    for review in reviews:
+        for category, found in matcher.match(review).items():
+            hits[category] += 1
+            counts[category].update(found)
+    return hits, counts
+
+
+def measure_rates(
+    rates_csv: str,
+    categories_path: str = "../data/categories.json",
+    exclusions_path: str = "../data/exclusions.json",
+    column_name: str = "review"
+) -> Dict[str, Dict[str, float]]:
+    """
+    Share of the reviews of a raw (unfiltered) dataset matching each category and each
+    exclusion category, in the format of RATES_PATH.
+    """
+    with open(categories_path, "r", encoding="utf-8") as f:
+        categories = json.load(f)
+    with open(exclusions_path, "r", encoding="utf-8") as f:
+        exclusions = json.load(f)
+
+    reviews = read_reviews(rates_csv, column_name)
+    category_hits, _ = match_counts(reviews, categories)
+    exclusion_hits, _ = match_counts(reviews, exclusions)
+    return {
+        "categories": {category: category_hits[category] / len(reviews) for category in categories},
+        "exclusions": {category: exclusion_hits[category] / len(reviews) for category in exclusions}
+    }
+
+
+def corpus_profile(
+    reference_csv: str = REFERENCE_DATASET,
+    rates: Dict[str, Dict[str, float]] = None,
+    categories_path: str = "../data/categories.json",
+    exclusions_path: str = "../data/exclusions.json"
+) -> Dict[str, object]:
+    """
+    Measure on the reference reviews what the synthetic corpus has to reproduce: review
+    lengths, filler word frequencies and the frequency of every keyword and exclusion phrase.
+
+    The share of reviews matching each category does not come from the reference reviews,
+    which are nearly all matches. It is given as rates ({"categories": {category: rate},
+    "exclusions": {category: rate}}), read from RATES_PATH when omitted.
+    """
+    from keyword_matcher import TOKEN_PATTERN, KeywordMatcher
+
+    with open(categories_path, "r", encoding="utf-8") as f:
+        categories = json.load(f)
+    with open(exclusions_path, "r", encoding="utf-8") as f:
+        exclusions = json.load(f)
+
+    if rates is None:
+        with open(RATES_PATH, "r", encoding="utf-8") as f:
+            rates = json.load(f)
+    for group, names in (("categories", categories), ("exclusions", exclusions)):
+        missing = set(names) - set(rates.get(group, {}))
+        if missing:
+            raise ValueError(f"No rate given for the {group} {sorted(missing)}")
+
+    reviews = read_reviews(reference_csv)
+    _, keyword_counts = match_counts(reviews, categories)
+    _, exclusion_counts = match_counts(reviews, exclusions)
+    words = Counter()
+    lengths = []
+    for review in reviews:
+        tokens = TOKEN_PATTERN.findall(review.lower())
+        lengths.append(len(tokens))
+        words.update(tokens)
+
+    def weights(phrases: List[str], counts: Counter) -> List[float]:
+        # Add-one smoothing keeps the keywords absent from the reference in the corpus
+        total = sum(counts[p] + 1 for p in phrases)
+        return [(counts[p] + 1) / total for p in phrases]
+
+    # Filler words matching a category on their own ("child", "dog") would add matches on top of the rates
+    keyword_matcher = KeywordMatcher(categories)
+    vocabulary = [(word, count) for word, count in words.most_common() if not keyword_matcher.match(word)]
+    vocabulary = vocabulary[:VOCABULARY_SIZE]
+    total_words = sum(count for _, count in vocabulary)
+    return {
+        "lengths": lengths,
+        "vocabulary": [word for word, _ in vocabulary],
+        "vocabulary_weights": [count / total_words for _, count in vocabulary],
+        "categories": {
+            category: {
+                "rate": rates["categories"][category],
+                "keywords": keywords,
+                "weights": weights(keywords, keyword_counts[category])
+            }
+            for category, keywords in categories.items()
+        },
+        "exclusions": {
+            category: {
+                "rate": rates["exclusions"][category],
+                "phrases": phrases,
+                "weights": weights(phrases, exclusion_counts[category])
+            }
+            for category, phrases in exclusions.items()
+        }
+    }
+
+
+def build_corpus(size: int, seed: int = 42, profile: Dict[str, object] = None, batch_size: int = 10_000) -> pl.DataFrame:
+    """
+    Generate a reproducible corpus of `size` reviews [id, review]: filler words drawn from the
+    reference vocabulary, with keywords and exclusion phrases inserted at the rates of the
+    profile and with the frequencies observed in the reference reviews.
+    """
+    profile = profile or corpus_profile()
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array(profile["vocabulary"], dtype=object)
+    lengths = np.array(profile["lengths"])
+    groups = [(g["keywords"], g["weights"], g["rate"]) for g in profile["categories"].values()]
+    groups += [(g["phrases"], g["weights"], g["rate"]) for g in profile["exclusions"].values()]
+
+    reviews = []
+    for start in range(0, size, batch_size):
+        n = min(batch_size, size - start)
+        review_lengths = rng.choice(lengths, size=n)
+        fillers = rng.choice(vocabulary, size=int(review_lengths.sum()), p=profile["vocabulary_weights"])
+        batch = [list(words) for words in np.split(fillers, np.cumsum(review_lengths)[:-1])]
+        for phrases, weights, rate in groups:
+            rows = np.flatnonzero(rng.random(n) < rate)
+            picked = rng.choice(len(phrases), size=len(rows), p=weights)
+            for row, phrase in zip(rows.tolist(), picked.tolist()):
+                words = batch[row]
+                words.insert(int(rng.integers(0, len(words) + 1)), phrases[phrase])
+        reviews.extend(" ".join(words) for words in batch)
+
+    return pl.DataFrame({"id": np.arange(size, dtype=np.int64), "review": reviews})
+
+
+def profile_rates(profile: Dict[str, object]) -> Dict[str, Dict[str, float]]:
+    """Category and exclusion rates of a profile, in the format of the rates argument of `corpus_profile`."""
+    return {
+        group: {category: values["rate"] for category, values in profile[group].items()}
+        for group in ("categories", "exclusions")
+    }
+
+
+def corpus_file(size: int, seed: int = 42, profile: Dict[str, object] = None, corpus_dir: str = CORPUS_DIR) -> str:
+    """
+    Path of the synthetic corpus of a given size, generated once as Parquet. The file name
+    holds a hash of the rates, so corpora generated with other rates are not reused.
+    """
+    profile = profile or corpus_profile()
+    rates_key = hashlib.sha256(json.dumps(profile_rates(profile), sort_keys=True).encode("utf-8")).hexdigest()
+    path = os.path.join(corpus_dir, f"corpus-{size}-{seed}-{rates_key[:12]}.parquet")
+    if not os.path.exists(path):
+        os.makedirs(corpus_dir, exist_ok=True)
+        build_corpus(size, seed, profile).write_parquet(path)
+        logger.info(f"Synthetic corpus of {size} reviews saved to {path}")
+    return path
+
+
+def peak_rss_mib() -> Dict[str, float]:
+    """Peak resident set size of this process and of its largest child (worker pools), in MiB."""
+    import resource
+    # ru_maxrss is in KiB on Linux, in bytes on macOS
+    unit = 1 if platform.system() == "Darwin" else 1024
+    return {
+        "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit / 2 ** 20,
+        "peak_rss_children_mib": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit / 2 ** 20
+    }
+
+
+def run_stage(stage: str, corpus_path: str, n_process: int = 4) -> Dict[str, object]:
+    """
+    Run one stage on a corpus generated by `corpus_file` in the current process and return
+    its measurements. The corpus loading and the keyword artifact are not timed. For
+    process_pipeline, the time spent in each of its stages is reported under "stages".
+    """
+    import pipeline_extraction_keywords as pek
+
+    df = pl.read_parquet(corpus_path)
+    size = df.height
+    keywords = pek.load_keyword_artifact()
+    stages = {}
+
+    start = time.perf_counter()
+    if stage == "remove_stopwords":
+        pek.remove_stopwords(df, "review")
+    elif stage == "lemmatize_column_fast":
+        pek.lemmatize_column_fast(df, "review", n_process=n_process)
+    elif stage == "extract_all_categories":
+        pek.extract_all_categories(
+            df, "review", keywords["categories"], keywords["exclusions"],
+            n_process=n_process, matcher=keywords["matcher"]
+        )
+    elif stage == "process_pipeline":
+        for name in ("prefilter_candidates", "lemmatize_column_fast", "extract_all_categories"):
+            function = getattr(pek, name)
+
+            def timed(*args, _function=function, _name=name, **kwargs):
+                stage_start = time.perf_counter()
+                result = _function(*args, **kwargs)
+                stages[_name] = stages.get(_name, 0.0) + time.perf_counter() - stage_start
+                return result
+
+            setattr(pek, name, timed)
+        with tempfile.TemporaryDirectory() as tmp:
+            input_csv = os.path.join(tmp, "reviews.csv")
+            df.write_csv(input_csv)
+            start = time.perf_counter()
+            pek.process_pipeline(
+                input_csv, "review", os.path.join(tmp, "keywords.csv"), n_process,
+                cache_dir=os.path.join(tmp, "lemmas")
+            )
+    else:
+        raise ValueError(f"Unknown benchmark stage: {stage}")
+    elapsed = time.perf_counter() - start
+
+    return {
+        "stage": stage,
+        "size": size,
+        "seconds": elapsed,
+        "rows_per_second": size / elapsed if elapsed else float("inf"),
+        **peak_rss_mib(),
+        **({"stages": stages} if stages else {})
+    }
+
+
+def measure_stage(stage: str, corpus_path: str, n_process: int) -> Dict[str, object]:
+    """Run a stage in a fresh interpreter, so peak RSS and warm caches do not leak between runs."""
+    code = (
+        "import json, benchmark_pipeline; "
+        f"print(json.dumps(benchmark_pipeline.run_stage({stage!r}, {os.path.abspath(corpus_path)!r}, {n_process})))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=SRC_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_benchmark(stages: List[str], sizes: List[int], n_process: int, seed: int,
+                  profile: Dict[str, object] = None) -> Dict[str, object]:
+    """Measure every (stage, size) pair and return the JSON-serializable report."""
+    profile = profile or corpus_profile()
+    results = []
+    for size in sizes:
+        # Generated once here rather than inside the measured runs
+        path = corpus_file(size, seed, profile)
+        for stage in stages:
+            result = measure_stage(stage, path, n_process)
+            logger.info(
+                f"{stage} on {size} reviews: {result['seconds']:.2f}s, {result['rows_per_second']:.0f} rows/s, "
+                f"peak RSS {result['peak_rss_mib']:.0f} MiB (workers {result['peak_rss_children_mib']:.0f} MiB)"
+            )
+            results.append(result)
+    return {
+        "commit": git_revision(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "n_process": n_process,
+        "seed": seed,
+        "rates": profile_rates(profile),
+        "results": results
+    }
+
+
+if __name__ == "__main__":
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    parser = argparse.ArgumentParser(prog="benchmark_pipeline.py",
+                                     description="Benchmark the keyword extraction stages on a synthetic corpus",
+                                     epilog="Exemple : python benchmark_pipeline.py --sizes 10000 100000 --output bench.json")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=SIZES,
+        help="Corpus sizes, in reviews."
+    )
+    parser.add_argument(
+        "--stages",
+        nargs="+",
+        choices=STAGES,
+        default=STAGES,
+        help="Stages to benchmark."
+    )
+    parser.add_argument(
+        "--n-process",
+        type=int,
+        default=4,
+        help="Number of worker processes given to the stages."
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=42,
+        help="Seed of the synthetic corpus."
+    )
+    parser.add_argument(
+        "--rates",
+        type=str,
+        default=RATES_PATH,
+        help='JSON file of the category rates, {"categories": {category: rate}, "exclusions": {category: rate}}.'
+    )
+    parser.add_argument(
+        "--rates-csv",
+        type=str,
+        default=None,
+        help="Raw (unfiltered) reviews to measure the category rates on, written to --rates before the run."
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="JSON file to write the report to, printed when omitted."
+    )
+    args = parser.parse_args()
+
+    if args.rates_csv:
+        rates = {"source": f"Measured on {args.rates_csv}", **measure_rates(args.rates_csv)}
+        with open(args.rates, "w", encoding="utf-8") as f:
+            json.dump(rates, f, indent=2)
+        logger.info(f"Category rates measured on {args.rates_csv} saved to {args.rates}")
+    with open(args.rates, "r", encoding="utf-8") as f:
+        rates = json.load(f)
+    profile = corpus_profile(rates=rates)
+    report = run_benchmark(args.stages, args.sizes, args.n_process, args.seed, profile)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Benchmark report saved to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
@@ -0,0 +1,112 @@
+import argparse
+import json
+import logging
+import os
+import time
+
+import polars as pl
+
+from pipeline_anomalies_processing import detect_language_parallel, translate_non_english_threadsafe
+
+logger = logging.getLogger(__name__)
+
+# Backend configurations compared by default: (name, translate_non_english_threadsafe arguments)
+CONFIGURATIONS = {
+    "offline-int8": {"backend": "offline", "quantize": True},
+    "offline-fp32": {"backend": "offline", "quantize": False},
+    "libretranslate": {"backend": "libretranslate"},
+    "google": {"backend": "google"},
+}
+
+
+def load_sample(input_csv: str, column_name: str, sample_size: int, seed: int = 42) -> pl.DataFrame:
+    """Sample non-English reviews, detecting their language first when the CSV does not have it."""
+    df = pl.read_csv(input_csv).drop_nulls(column_name)
+    if "detected_lang" not in df.columns:
+        df, _ = detect_language_parallel(df, column_name, num_threads=1)
+    df = df.filter(pl.col("detected_lang") != "en")
+    return df.sample(min(sample_size, df.height), seed=seed, shuffle=True)
+
+
+def run_configuration(df: pl.DataFrame, column_name: str, name: str, num_threads: int, model_path: str = None,
+                      url: str = None, rate: float = 5.0) -> dict:
+    """
+    Translate the sample with one backend configuration, without gate nor cache, and return
+    its throughput. CPU time covers every thread of the process (PyTorch threads for the
+    offline backend, HTTP and JSON work for the online ones), so texts per CPU second is the
+    throughput per core.
+    """
+    kwargs = dict(CONFIGURATIONS[name], num_threads=num_threads, model_path=model_path, url=url, rate=rate)
+    if kwargs["backend"] == "offline":
+        # Load the model before timing, it is loaded once per run in the pipeline
+        translate_non_english_threadsafe(df.head(1), column_name, gate=False, cache_dir=None, **kwargs)
+
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    df_translated, _ = translate_non_english_threadsafe(df, column_name, gate=False, cache_dir=None, **kwargs)
+    wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+    nb_translated = df_translated.filter(pl.col("translation_status") == "translated").height
+    characters = df[column_name].str.len_chars().sum()
+    return {
+        "configuration": name,
+        "texts": df.height,
+        "translated": nb_translated,
+        "seconds": wall,
+        "cpu_seconds": cpu,
+        "threads": num_threads,
+        "texts_per_second": df.height / wall if wall else float("inf"),
+        "characters_per_second": characters / wall if wall else float("inf"),
+        "texts_per_cpu_second": df.height / cpu if cpu else float("inf")
+    }
+
+
+if __name__ == "__main__":
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    parser = argparse.ArgumentParser(prog="benchmark_translation.py",
+                                     description="Compare the throughput of the translation backends",
+                                     epilog="Exemple : python benchmark_translation.py --input ../data/processed/test.csv --col review --url http://localhost:5000/translate")
+    parser.add_argument("--input", type=str, required=True, help="CSV holding the reviews (and optionally detected_lang).")
+    parser.add_argument("--col", type=str, required=True, help="Column holding the reviews.")
+    parser.add_argument("--sample", type=int, default=500, help="Number of non-English reviews to translate.")
+    parser.add_argument(
+        "--configurations",
+        nargs="+",
+        choices=list(CONFIGURATIONS),
+        default=["offline-int8", "offline-fp32", "libretranslate"],
+        help="Backend configurations to compare."
+    )
+    parser.add_argument("--threads", type=int, default=os.cpu_count(), help="Threads (offline) or requests in flight (online).")
+    parser.add_argument("--model_path", type=str, default=None, help="Offline model, ../m2m100_418M by default.")
+    parser.add_argument("--url", type=str, default=None, help="LibreTranslate-compatible /translate endpoint.")
+    parser.add_argument("--rate", type=float, default=5.0, help="Requests per second sent to --url.")
+    parser.add_argument("--output", type=str, default=None, help="JSON file to write the report to, printed when omitted.")
+    args = parser.parse_args()
+
+    df_sample = load_sample(args.input, args.col, args.sample)
+    logger.info(f"{df_sample.height} non-English reviews sampled")
+
+    results = []
+    for configuration in args.configurations:
+        if configuration == "libretranslate" and not args.url:
+            logger.warning("libretranslate skipped: no --url given")
+            continue
+        result = run_configuration(df_sample, args.col, configuration, args.threads, args.model_path, args.url, args.rate)
+        logger.info(
+            f"{configuration}: {result['texts_per_second']:.2f} texts/s, "
+            f"{result['texts_per_cpu_second']:.2f} texts per CPU second, {result['translated']}/{result['texts']} translated"
+        )
+        results.append(result)
+
+    report = {"input": args.input, "threads": args.threads, "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Benchmark report saved to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
@@ -0,0 +1,58 @@
+import hashlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import diskcache
+
+# Default size bound of an on-disk cache (1 GiB)
+DEFAULT_SIZE_LIMIT = 2 ** 30
+
+
+class DiskCache:
+    """
+    Size-bounded on-disk key/value store behind the persistent caches of the pipelines.
+
+    Keys are the SHA-1 of a namespace ("lemma", "translation") followed by the parts
+    identifying an entry, so caches of different kinds never collide, even in a shared
+    directory. diskcache evicts the least recently used entries once `size_limit` bytes
+    are exceeded. Hits and misses of the lookups are counted for `stats`.
+    """
+
+    def __init__(self, directory: str, namespace: str, size_limit: int = DEFAULT_SIZE_LIMIT):
+        self.cache = diskcache.Cache(
+            directory,
+            size_limit=size_limit,
+            eviction_policy="least-recently-used"
+        )
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+
+    def digest(self, *parts: str) -> str:
+        return hashlib.sha1("\0".join((self.namespace, *parts)).encode("utf-8")).hexdigest()
+
+    def get_keys(self, keys: List[str]) -> List[Optional[str]]:
+        """Return the value stored under each key, or None when it is missing."""
+        with self.cache.transact():
+            results = [self.cache.get(key) for key in keys]
+        nb_hits = sum(result is not None for result in results)
+        self.hits += nb_hits
+        self.misses += len(results) - nb_hits
+        return results
+
+    def set_keys(self, items: Iterable[Tuple[str, str]]) -> None:
+        """Store (key, value) pairs."""
+        with self.cache.transact():
+            for key, value in items:
+                self.cache.set(key, value)
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size_bytes": self.cache.volume()
+        }
+
+    def close(self) -> None:
+        self.cache.close()
@@ -0,0 +1,120 @@
+import argparse
+import logging
+import os
+import random
+import sys
+
+import polars as pl
+
+try:
+    from .pipeline_anomalies_processing import remove_special_characters
+except ImportError:
+    from pipeline_anomalies_processing import remove_special_characters
+
+logger = logging.getLogger(__name__)
+
+GOLDEN_PATH = "../data/golden/remove_special_characters.parquet"
+
+# Values of `keep` checked: none, the usual punctuation, and regex metacharacters
+KEEP_VALUES = ("", ".,", ".,&~ #-]^\\")
+
+# Hand-written cases: emails, URLs, hashtags, apostrophes, Unicode letters and digits,
+# separators where Python's and Rust's regex classes disagree
+BASE_CASES = [
+    "Contact me at john.doe@mail.com!! It's great",
+    "Visit https://x.com/a?b=1 and www.site.org/page, ok?",
+    "#travel #dogs love it 😀😀",
+    "Don’t   do it\t\nplease",
+    " trailing spaces  ",
+    "",
+    "café naïve résumé — “quotes” «fr»",
+    "½ price ² ³ ① Ⅻ",
+    "e\u0301 combining",
+    "Hindi हिन्दी text",
+    "a\x1cb\x1dc\x1fd\x85e\xa0f\u2028g\u3000h",
+    "under_score and-dash",
+    ".dot@x.com @handle a@b.c",
+    "mail:.x@y.zz end",
+    "中文，标点。",
+    "ﬁ ligature ＡＢＣ１２３",
+    "tab\ttab",
+    "x#y #z",
+    "http://a.b https://",
+    "it''s ’’",
+    "‿ tie ⁀",
+    "\u200bzero width",
+]
+
+# Fragments the random cases are drawn from
+FRAGMENTS = list("abcXYZ019 _-.,!?@#%&*()[]{}'’\"/:;\t\n\x1c\xa0éß½²٣") + [
+    "😀", "\u0301", "ह", "ि", "www.", "http://", "@a.co", "#tag"
+]
+
+
+def golden_inputs(size: int = 5000, seed: int = 3) -> list:
+    """Hand-written cases, size random strings of up to 40 fragments, and a null."""
+    rng = random.Random(seed)
+    generated = ["".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 40))) for _ in range(size)]
+    return BASE_CASES + generated + [None]
+
+
+def build_golden(path: str = GOLDEN_PATH, size: int = 5000, seed: int = 3) -> pl.DataFrame:
+    """
+    Write the golden set (keep, input, expected) with the current implementation.
+    Only meant to be run on a reference version of remove_special_characters.
+    """
+    texts = golden_inputs(size, seed)
+    golden = pl.concat([
+        pl.DataFrame({
+            "keep": [keep] * len(texts),
+            "input": texts,
+            "expected": remove_special_characters(pl.DataFrame({"input": texts}), "input", keep)["input"]
+        }, schema={"keep": pl.Utf8, "input": pl.Utf8, "expected": pl.Utf8})
+        for keep in KEEP_VALUES
+    ])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    golden.write_parquet(path)
+    logger.info(f"Golden set of {golden.height} cases saved to {path}")
+    return golden
+
+
+def compare_golden(path: str = GOLDEN_PATH) -> pl.DataFrame:
+    """
+    Run remove_special_characters on the golden inputs.
+
+    Returns:
+        pl.DataFrame: Mismatching cases (keep, input, expected, output), empty when every output matches.
+    """
+    golden = pl.read_parquet(path)
+    results = []
+    for (keep,), group in golden.group_by("keep", maintain_order=True):
+        output = remove_special_characters(group.select("input"), "input", keep)["input"]
+        results.append(group.with_columns(output.alias("output")))
+    return pl.concat(results).filter(pl.col("output").ne_missing(pl.col("expected")))
+
+
+if __name__ == "__main__":
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    parser = argparse.ArgumentParser(prog="golden_special_characters.py",
+                                     description="Compare remove_special_characters with its golden outputs",
+                                     epilog="Exemple : python golden_special_characters.py --golden ../data/golden/remove_special_characters.parquet")
+    parser.add_argument("--golden", type=str, default=GOLDEN_PATH, help="Parquet golden set (keep, input, expected).")
+    parser.add_argument("--build", action="store_true", help="Rewrite the golden set with the current implementation.")
+    args = parser.parse_args()
+
+    if args.build:
+        build_golden(args.golden)
+        sys.exit(0)
+
+    mismatches = compare_golden(args.golden)
+    if mismatches.height:
+        for row in mismatches.head(20).iter_rows(named=True):
+            logger.error(f"keep={row['keep']!r} input={row['input']!r}: expected {row['expected']!r}, got {row['output']!r}")
+        logger.error(f"{mismatches.height} golden cases differ")
+        sys.exit(1)
+    logger.info("Every golden case matches")
@@ -0,0 +1,169 @@
+import os
+import pickle
+import re
+import zlib
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import numpy as np
+import polars as pl
+
+try:
+    from .keyword_matcher import TOKEN_PATTERN, KeywordMatcher, normalize_keyword, phrase_regex
+except ImportError:
+    from keyword_matcher import TOKEN_PATTERN, KeywordMatcher, normalize_keyword, phrase_regex
+
+# Bump when the on-disk layout of the index changes
+INDEX_VERSION = 1
+
+
+def encode_postings(rows: np.ndarray) -> bytes:
+    """Compress a sorted array of row positions: delta encoding followed by zlib."""
+    deltas = np.diff(rows.astype(np.uint32), prepend=np.uint32(0))
+    return zlib.compress(deltas.astype(np.uint32).tobytes())
+
+
+def decode_postings(data: bytes) -> np.ndarray:
+    return np.cumsum(np.frombuffer(zlib.decompress(data), dtype=np.uint32), dtype=np.uint32)
+
+
+class InvertedIndex:
+    """
+    Inverted index mapping each lemma token to the compressed posting list of the
+    reviews (row positions) containing it.
+
+    Built once from a `<col>_lemmatized` column, it answers keyword queries without
+    rescanning every review: posting lists are intersected to find candidate rows
+    and only those texts are checked against the exact phrase / exclusion rules of
+    KeywordMatcher. Tokens are the lowercase `\\w+` runs used by KeywordMatcher.
+    """
+
+    def __init__(self, ids: list, texts: List[Optional[str]], postings: Dict[str, bytes]):
+        self.ids = ids
+        self.texts = texts
+        self.postings = postings
+        self._decoded = lru_cache(maxsize=4096)(self._decode)
+
+    @classmethod
+    def build(cls, df: pl.DataFrame, col_name: str, id_col: str = "id") -> "InvertedIndex":
+        """Build the index from a lemmatized text column, with Polars doing the tokenization."""
+        grouped = (
+            df.select(pl.col(col_name).alias("text"))
+            .with_row_index("row")
+            .select("row", pl.col("text").str.to_lowercase().str.extract_all(r"\w+").alias("token"))
+            .explode("token")
+            .drop_nulls("token")
+            .unique(maintain_order=True)
+            .group_by("token")
+            .agg(pl.col("row").sort())
+        )
+        postings = {
+            token: encode_postings(np.asarray(rows, dtype=np.uint32))
+            for token, rows in zip(grouped["token"].to_list(), grouped["row"].to_list())
+        }
+        return cls(df[id_col].to_list(), df[col_name].to_list(), postings)
+
+    def save(self, directory: str) -> None:
+        """Persist the index: texts and ids as Parquet, posting lists as a pickle."""
+        os.makedirs(directory, exist_ok=True)
+        pl.DataFrame({"id": self.ids, "text": self.texts}).write_parquet(os.path.join(directory, "texts.parquet"))
+        with open(os.path.join(directory, "postings.pkl"), "wb") as f:
+            pickle.dump({"version": INDEX_VERSION, "postings": self.postings}, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, directory: str) -> "InvertedIndex":
+        with open(os.path.join(directory, "postings.pkl"), "rb") as f:
+            data = pickle.load(f)
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"Index in {directory} has version {data.get('version')}, expected {INDEX_VERSION}")
+        texts = pl.read_parquet(os.path.join(directory, "texts.parquet"))
+        return cls(texts["id"].to_list(), texts["text"].to_list(), data["postings"])
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def _decode(self, token: str) -> np.ndarray:
+        data = self.postings.get(token)
+        return decode_postings(data) if data is not None else np.empty(0, dtype=np.uint32)
+
+    def rows(self, token: str) -> np.ndarray:
+        """Sorted row positions of the reviews containing a token."""
+        return self._decoded(token.lower())
+
+    def candidates(self, phrase: str) -> np.ndarray:
+        """Rows containing every token of a phrase (a superset of the phrase matches)."""
+        tokens = TOKEN_PATTERN.findall(normalize_keyword(phrase).lower())
+        if not tokens:
+            return np.empty(0, dtype=np.uint32)
+        # Intersect from the rarest token, so the working set only shrinks
+        postings = sorted((self.rows(token) for token in set(tokens)), key=len)
+        result = postings[0]
+        for rows in postings[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, rows, assume_unique=True)
+        return result
+
+    def phrase(self, phrase: str) -> np.ndarray:
+        """Rows where the phrase occurs, with KeywordMatcher's word boundary and separator rules."""
+        pattern = phrase_regex(phrase)
+        if not pattern:
+            return np.empty(0, dtype=np.uint32)
+        regex = re.compile(pattern, flags=re.IGNORECASE)
+        rows = self.candidates(phrase)
+        if len(TOKEN_PATTERN.findall(phrase)) < 2:
+            return rows
+        return np.array([row for row in rows if regex.search(self.texts[row])], dtype=np.uint32)
+
+    def query(
+        self,
+        all_of: List[str] = None,
+        any_of: List[str] = None,
+        none_of: List[str] = None
+    ) -> np.ndarray:
+        """
+        Boolean query over phrases: rows matching every phrase of all_of, at least one
+        phrase of any_of and none of the phrases of none_of. Returns sorted row positions.
+        """
+        result = None
+        for phrase in all_of or []:
+            rows = self.phrase(phrase)
+            result = rows if result is None else np.intersect1d(result, rows, assume_unique=True)
+        if any_of:
+            rows = np.unique(np.concatenate([self.phrase(phrase) for phrase in any_of]))
+            result = rows if result is None else np.intersect1d(result, rows, assume_unique=True)
+        if result is None:
+            result = np.arange(len(self.texts), dtype=np.uint32)
+        for phrase in none_of or []:
+            result = np.setdiff1d(result, self.phrase(phrase), assume_unique=True)
+        return result
+
+    def search(self, keyword: str, exclusions: List[str] = None) -> np.ndarray:
+        """
+        Rows where the keyword still occurs once the exclusion phrases are masked out,
+        i.e. the rule applied by `extract_all_categories` for a single keyword.
+        """
+        rows = self.phrase(keyword)
+        if not exclusions:
+            return rows
+        matcher = KeywordMatcher({"query": [keyword]}, {"query": exclusions})
+        return np.array([row for row in rows if matcher.match(self.texts[row])], dtype=np.uint32)
+
+    def ids_of(self, rows: np.ndarray) -> list:
+        return [self.ids[row] for row in rows]
+
+    def extract(self, matcher: KeywordMatcher, offsets: bool = False) -> Dict[int, Dict[str, list]]:
+        """
+        Run a KeywordMatcher on the candidate rows only, i.e. rows holding every token
+        of at least one keyword. Returns {row: {category: [matched keywords]}} in row order,
+        or {row: {category: [(keyword, start, end)]}} with offsets=True (see `match_spans`).
+        """
+        match = matcher.match_spans if offsets else matcher.match
+        keywords = {kw for keywords in matcher.categories.values() for kw in keywords}
+        rows = np.unique(np.concatenate([self.candidates(kw) for kw in keywords] or [np.empty(0, dtype=np.uint32)]))
+        results = {}
+        for row in rows.tolist():
+            matched = match(self.texts[row])
+            if matched:
+                results[row] = matched
+        return results
@@ -0,0 +1,193 @@
+import re
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+# A token is a run of word characters, exactly what `\b` delimits in the regex engine
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def normalize_keyword(kw: str) -> str:
+    """Normalize a keyword the same way lemmatized reviews are cleaned."""
+    return kw.strip().replace(" - ", "-")
+
+
+def separator_regex(separator: str) -> str:
+    """
+    Translate the characters found between two keyword tokens into the regex
+    used historically by `make_regex`: a hyphen matches a hyphen or a single
+    whitespace, a space matches any run of whitespace.
+    """
+    return re.escape(separator).replace("\\-", "[-\\s]").replace("\\ ", "\\s+")
+
+
+def phrase_regex(phrase: str) -> str:
+    """
+    Build a regex matching a keyword or exclusion phrase on word boundaries,
+    with the same token and separator rules as KeywordMatcher. Only uses syntax
+    shared by Python `re` and the Rust regex engine behind Polars.
+    Returns an empty string for phrases without any word character.
+    """
+    phrase = normalize_keyword(phrase).lower()
+    tokens = list(TOKEN_PATTERN.finditer(phrase))
+    if not tokens:
+        return ""
+    pattern = re.escape(tokens[0].group())
+    for previous, current in zip(tokens, tokens[1:]):
+        pattern += separator_regex(phrase[previous.end():current.start()]) + re.escape(current.group())
+    return r"\b" + pattern + r"\b"
+
+
+def merge_spans(spans: List[Tuple[int, int]]) -> Tuple[List[int], List[int]]:
+    """Merge (start, end) character intervals into sorted, disjoint (starts, ends) lists."""
+    starts, ends = [], []
+    for start, end in sorted(spans):
+        if ends and start < ends[-1]:
+            ends[-1] = max(ends[-1], end)
+        else:
+            starts.append(start)
+            ends.append(end)
+    return starts, ends
+
+
+def overlaps(intervals: Tuple[List[int], List[int]], start: int, end: int) -> bool:
+    """Whether [start, end) overlaps one of the intervals returned by `merge_spans`."""
+    starts, ends = intervals
+    # Last interval starting before the span ends
+    i = bisect_left(starts, end) - 1
+    return i >= 0 and ends[i] > start
+
+
+class KeywordMatcher:
+    """
+    Multi-pattern matcher compiling every category keyword and exclusion phrase
+    once into a single trie over lowercase tokens.
+
+    Each review is tokenized once and scanned once: from every token position the
+    trie is walked as far as the review allows, collecting keyword and exclusion
+    hits for all categories at the same time. Exclusion hits become character
+    offset intervals, and a keyword hit only counts if it does not overlap an
+    excluded interval of the same category; the review text is never rewritten.
+
+    `variants` optionally registers extra surface forms for a keyword or exclusion
+    phrase ({phrase: [forms]}, e.g. inflections); a hit on any form is reported
+    as the phrase itself.
+    """
+
+    def __init__(
+        self,
+        categories: Dict[str, List[str]],
+        exclusions: Optional[Dict[str, List[str]]] = None,
+        variants: Optional[Dict[str, List[str]]] = None
+    ):
+        self.categories = {cat: list(kws) for cat, kws in categories.items()}
+        self.exclusions = {cat: list(exs) for cat, exs in (exclusions or {}).items()}
+        self._separators = {}
+        # Nested dicts {token: child}; terminal entries are stored under the None key
+        self._trie = {}
+        variants = variants or {}
+
+        for category, keywords in self.categories.items():
+            for position, kw in enumerate(keywords):
+                for form in dict.fromkeys([kw, *variants.get(kw, [])]):
+                    self._add_phrase(form, (True, category, position))
+        for category, phrases in self.exclusions.items():
+            if category not in self.categories:
+                continue
+            for position, phrase in enumerate(phrases):
+                for form in dict.fromkeys([phrase, *variants.get(phrase, [])]):
+                    self._add_phrase(form, (False, category, position))
+
+    def _add_phrase(self, phrase: str, entry: Tuple[bool, str, int]) -> None:
+        phrase = normalize_keyword(phrase).lower()
+        tokens = list(TOKEN_PATTERN.finditer(phrase))
+        if not tokens:
+            return
+
+        gaps = []
+        for previous, current in zip(tokens, tokens[1:]):
+            separator = phrase[previous.end():current.start()]
+            if separator not in self._separators:
+                self._separators[separator] = re.compile(separator_regex(separator))
+            gaps.append(self._separators[separator])
+
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token.group(), {})
+        node.setdefault(None, []).append((tuple(gaps), entry))
+
+    def _scan(self, text: str) -> List[Tuple[bool, str, int, int, int]]:
+        """Return every (is_keyword, category, position, start, end) hit, with character offsets."""
+        tokens = [(m.group().lower(), m.start(), m.end()) for m in TOKEN_PATTERN.finditer(text)]
+        hits = []
+        for start in range(len(tokens)):
+            node = self._trie
+            end = start
+            while end < len(tokens):
+                node = node.get(tokens[end][0])
+                if node is None:
+                    break
+                for gaps, (is_keyword, category, position) in node.get(None, ()):
+                    if all(
+                        gap.fullmatch(text, tokens[start + i][2], tokens[start + i + 1][1])
+                        for i, gap in enumerate(gaps)
+                    ):
+                        hits.append((is_keyword, category, position, tokens[start][1], tokens[end][2]))
+                end += 1
+        return hits
+
+    def _kept_hits(self, text: str) -> List[Tuple[str, int, int, int]]:
+        """
+        Return the (category, position, start, end) keyword hits that survive the exclusions.
+        Exclusion hits are merged once into sorted, disjoint offset intervals per category.
+        """
+        hits = self._scan(text)
+        excluded = {}
+        for is_keyword, category, _, start, end in hits:
+            if not is_keyword:
+                excluded.setdefault(category, []).append((start, end))
+
+        intervals = {category: merge_spans(spans) for category, spans in excluded.items()}
+
+        kept = []
+        for is_keyword, category, position, start, end in hits:
+            if not is_keyword:
+                continue
+            if category in intervals and overlaps(intervals[category], start, end):
+                continue
+            kept.append((category, position, start, end))
+        return kept
+
+    def match(self, text: str) -> Dict[str, List[str]]:
+        """
+        Return {category: [matched keywords]} for a single review.
+
+        Keywords are listed in the order of the category keyword list and
+        categories without any remaining keyword are omitted.
+        """
+        if not isinstance(text, str):
+            return {}
+
+        matched = {}
+        for category, position, _, _ in self._kept_hits(text):
+            matched.setdefault(category, set()).add(position)
+
+        return {
+            category: [self.categories[category][p] for p in sorted(matched[category])]
+            for category in self.categories
+            if category in matched
+        }
+
+    def match_spans(self, text: str) -> Dict[str, List[Tuple[str, int, int]]]:
+        """
+        Return {category: [(keyword, start, end)]} for a single review: the character
+        offsets of every kept keyword occurrence, in text order, e.g. to highlight them.
+        """
+        if not isinstance(text, str):
+            return {}
+
+        spans = {}
+        for category, position, start, end in sorted(self._kept_hits(text), key=lambda hit: hit[2:]):
+            spans.setdefault(category, []).append((self.categories[category][position], start, end))
+
+        # The same occurrence is reported once, even for a keyword listed twice
+        return {category: list(dict.fromkeys(spans[category])) for category in self.categories if category in spans}
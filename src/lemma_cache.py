@@ -0,0 +1,31 @@
+from typing import Iterable, List, Optional, Tuple
+
+try:
+    from .disk_cache import DEFAULT_SIZE_LIMIT, DiskCache
+except ImportError:
+    from disk_cache import DEFAULT_SIZE_LIMIT, DiskCache
+
+
+class LemmaCache(DiskCache):
+    """
+    Content-addressed on-disk cache of lemmatized texts.
+
+    Entries are keyed by the raw text together with a model key (spaCy model
+    name/version, enabled pipes, spaCy version), so changing the model
+    invalidates every entry without having to clear the directory.
+    """
+
+    def __init__(self, directory: str, model_key: str, size_limit: int = DEFAULT_SIZE_LIMIT):
+        super().__init__(directory, "lemma", size_limit)
+        self.model_key = model_key
+
+    def key(self, text: str) -> str:
+        return self.digest(self.model_key, text)
+
+    def get_many(self, texts: List[str]) -> List[Optional[str]]:
+        """Return the cached lemmatization of each text, or None when it is missing."""
+        return self.get_keys([self.key(text) for text in texts])
+
+    def set_many(self, items: Iterable[Tuple[str, str]]) -> None:
+        """Store (text, lemmatized text) pairs."""
+        self.set_keys((self.key(text), lemmatized) for text, lemmatized in items)
@@ -0,0 +1,183 @@
+from typing import Tuple
+
+import numpy as np
+import polars as pl
+
+# Number of shingles hashed at once: the (shingles x num_perm) uint32 working matrix
+# (512 KiB with 128 permutations) stays in the CPU cache, about 3x faster than 2^18
+SHINGLE_BATCH = 1 << 10
+
+
+def normalize_reviews(texts: pl.Series) -> pl.Series:
+    """Lowercase, replace punctuation by spaces and collapse whitespace, so reposts differing only by those match."""
+    return (
+        texts.fill_null("")
+        .str.to_lowercase()
+        .str.replace_all(r"[^\p{L}\p{N}]+", " ")
+        .str.strip_chars(" ")
+    )
+
+
+def _mix64(x: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer, spreads the polynomial shingle hashes over 64 bits."""
+    with np.errstate(over="ignore"):
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+
+def _mix32(x: np.ndarray) -> np.ndarray:
+    """MurmurHash3 32-bit finalizer, a cheap bijective mix of uint32 values (in place)."""
+    x ^= x >> np.uint32(16)
+    x *= np.uint32(0x85EBCA6B)
+    x ^= x >> np.uint32(13)
+    x *= np.uint32(0xC2B2AE35)
+    x ^= x >> np.uint32(16)
+    return x
+
+
+def shingle_hashes(texts: pl.Series, shingle_size: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hash every character shingle of every text in one vectorized pass over the UTF-8
+    bytes of the column (no Python loop per text or per shingle).
+
+    Texts shorter than shingle_size are right-padded with spaces so they still get one
+    shingle; empty texts get none.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: 32-bit shingle hashes of all texts concatenated,
+        and the doc index of each hash.
+    """
+    lengths = texts.str.len_bytes().to_numpy()
+    padded = texts.str.pad_end(shingle_size, " ").zip_with(pl.Series(lengths > 0), texts)
+    lengths = padded.str.len_bytes().to_numpy().astype(np.int64)
+    data = np.frombuffer(padded.str.join("").item().encode("utf-8"), dtype=np.uint8)
+    if data.size < shingle_size:
+        return np.empty(0, dtype=np.uint32), np.empty(0, dtype=np.int64)
+
+    # Polynomial hash of every window of shingle_size bytes of the concatenation
+    windows = np.lib.stride_tricks.sliding_window_view(data, shingle_size)
+    hashes = np.zeros(len(windows), dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for j in range(shingle_size):
+            hashes = hashes * np.uint64(257) + windows[:, j].astype(np.uint64)
+    hashes = (_mix64(hashes) >> np.uint64(32)).astype(np.uint32)
+
+    # Keep the windows lying inside a single text
+    ends = np.cumsum(lengths)
+    docs = np.repeat(np.arange(len(lengths)), lengths)[: len(windows)]
+    valid = np.arange(len(windows)) + shingle_size <= ends[docs]
+    return hashes[valid], docs[valid]
+
+
+def minhash_signatures(
+    texts: pl.Series, num_perm: int = 128, shingle_size: int = 5, seed: int = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    MinHash signature of every text: for each of num_perm hash functions, the minimum
+    over the text's shingles, computed with np.minimum.reduceat on batches of shingles.
+    The i-th hash function is the Murmur3 finalizer of the shingle hash xored with a
+    random seed. A linear (a * x + b) mod p family with 32-bit coefficients would favour
+    the shingles of small hash values and over-estimate similarities.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (n_texts, num_perm) uint32 signatures and a mask
+        of the texts that have at least one shingle.
+    """
+    seeds = np.random.default_rng(seed).integers(0, 1 << 32, size=num_perm, dtype=np.uint32)
+
+    hashes, docs = shingle_hashes(normalize_reviews(texts), shingle_size)
+    signatures = np.full((len(texts), num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+    has_shingles = np.zeros(len(texts), dtype=bool)
+    has_shingles[docs] = True
+
+    for start in range(0, len(hashes), SHINGLE_BATCH):
+        batch_hashes = hashes[start:start + SHINGLE_BATCH]
+        batch_docs = docs[start:start + SHINGLE_BATCH]
+        permuted = _mix32(batch_hashes[:, None] ^ seeds)
+        boundaries = np.flatnonzero(np.r_[True, batch_docs[1:] != batch_docs[:-1]])
+        minima = np.minimum.reduceat(permuted, boundaries, axis=0)
+        # A text split over two batches keeps the minimum of both
+        doc_ids = batch_docs[boundaries]
+        signatures[doc_ids] = np.minimum(signatures[doc_ids], minima)
+    return signatures, has_shingles
+
+
+def lsh_params(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    Number of bands and rows per band minimizing the false positive and false negative
+    areas of the LSH S-curve 1 - (1 - s^r)^b around the Jaccard threshold.
+    """
+    similarities = np.linspace(0.0, 1.0, 1001)
+    best, best_error = (1, num_perm), float("inf")
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        probability = 1.0 - (1.0 - similarities ** rows) ** bands
+        below = similarities < threshold
+        error = np.trapezoid(np.where(below, probability, 1.0 - probability), similarities)
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+def _find(parents: np.ndarray, i: int) -> int:
+    root = i
+    while parents[root] != root:
+        root = parents[root]
+    while parents[i] != root:
+        parents[i], i = root, parents[i]
+    return root
+
+
+def near_duplicate_clusters(signatures: np.ndarray, has_shingles: np.ndarray, threshold: float = 0.8) -> np.ndarray:
+    """
+    Cluster texts whose estimated Jaccard similarity reaches the threshold.
+
+    Signatures are cut into bands; texts sharing a whole band are candidate pairs (each
+    bucket is reduced to pairs with its first member, so the number of candidates stays
+    linear in the bucket sizes). Candidates are verified on the full signatures, then
+    merged with a union-find.
+
+    Returns:
+        np.ndarray: Cluster representative of every text, the lowest position of its cluster.
+    """
+    n_texts, num_perm = signatures.shape
+    bands, rows = lsh_params(threshold, num_perm)
+    candidates = np.flatnonzero(has_shingles)
+    if len(candidates) < 2:
+        return np.arange(n_texts)
+    multipliers = np.random.default_rng(0).integers(1, 1 << 63, size=rows, dtype=np.uint64) | np.uint64(1)
+
+    pairs = [np.empty((0, 2), dtype=np.int64)]
+    for band in range(bands):
+        # Bucket key of the band (colliding keys are filtered out by the verification)
+        with np.errstate(over="ignore"):
+            keys = (signatures[candidates, band * rows:(band + 1) * rows] * multipliers).sum(axis=1)
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        first_of_bucket = np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]
+        heads = order[np.maximum.accumulate(np.where(first_of_bucket, np.arange(len(order)), 0))]
+        members = ~first_of_bucket
+        pairs.append(np.stack([candidates[heads[members]], candidates[order[members]]], axis=1))
+
+    pairs = np.unique(np.concatenate(pairs), axis=0)
+    verified = (signatures[pairs[:, 0]] == signatures[pairs[:, 1]]).mean(axis=1) >= threshold
+
+    parents = np.arange(n_texts)
+    for i, j in pairs[verified].tolist():
+        root_i, root_j = _find(parents, i), _find(parents, j)
+        if root_i != root_j:
+            # The earliest text of a cluster is its representative
+            parents[max(root_i, root_j)] = min(root_i, root_j)
+
+    # Parents always point backwards: jump pointers until every text points at its root
+    while True:
+        grandparents = parents[parents]
+        if np.array_equal(grandparents, parents):
+            return parents
+        parents = grandparents
+
+
+def estimated_similarity(signatures: np.ndarray, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Estimated Jaccard similarity of the texts at positions left and right (share of equal MinHash values)."""
+    return (signatures[left] == signatures[right]).mean(axis=1)
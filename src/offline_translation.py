@@ -0,0 +1,122 @@
+import logging
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Local copy of facebook/m2m100_418M (the hub name also works when online)
+OFFLINE_MODEL = "../m2m100_418M"
+
+
+class OfflineTranslator:
+    """
+    Local seq2seq translation on CPU with transformers (M2M100 by default, any
+    multilingual model whose tokenizer has `src_lang` / `get_lang_id` works).
+
+    Texts are grouped by source language, sorted by token length and batched so that
+    a batch holds at most max_batch_tokens padded tokens: short reviews go in large
+    batches, long ones in small batches, and little compute is spent on padding.
+    With quantize=True the Linear layers are converted to int8 with PyTorch dynamic
+    quantization; num_threads bounds the intra-op threads used by PyTorch.
+    """
+
+    def __init__(
+        self,
+        model_name: str = OFFLINE_MODEL,
+        num_threads: int = None,
+        quantize: bool = True,
+        max_batch_tokens: int = 4096,
+        max_length: int = 256,
+        num_beams: int = 1
+    ):
+        import torch
+        from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+        if num_threads:
+            torch.set_num_threads(num_threads)
+        self.torch = torch
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModelForSeq2SeqLM.from_pretrained(model_name).eval()
+        if quantize:
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        self.model = model
+        self.max_batch_tokens = max_batch_tokens
+        self.max_length = max_length
+        self.num_beams = num_beams
+        logger.info(
+            f"Offline translator {model_name} loaded ({'int8' if quantize else 'fp32'}, "
+            f"{torch.get_num_threads()} threads)"
+        )
+
+    def supports(self, lang: str) -> bool:
+        lang_codes = getattr(self.tokenizer, "lang_code_to_id", None)
+        return lang_codes is None or lang in lang_codes
+
+    def batches(self, texts: List[str]) -> List[List[int]]:
+        """Group text positions into batches of similar token length under max_batch_tokens."""
+        lengths = [
+            min(len(ids), self.max_length)
+            for ids in self.tokenizer(texts, truncation=True, max_length=self.max_length)["input_ids"]
+        ]
+        batches, current = [], []
+        for i in sorted(range(len(texts)), key=lambda i: lengths[i]):
+            # Sorted by length: the current text is the longest of the batch
+            if current and lengths[i] * (len(current) + 1) > self.max_batch_tokens:
+                batches.append(current)
+                current = []
+            current.append(i)
+        if current:
+            batches.append(current)
+        return batches
+
+    def translate(self, texts: List[str], source: str, target: str = "en") -> List[str]:
+        """Translate texts of a single source language."""
+        if hasattr(self.tokenizer, "src_lang"):
+            self.tokenizer.src_lang = source
+        generate_kwargs = {"num_beams": self.num_beams, "max_new_tokens": self.max_length}
+        if hasattr(self.tokenizer, "get_lang_id"):
+            generate_kwargs["forced_bos_token_id"] = self.tokenizer.get_lang_id(target)
+
+        translations = [None] * len(texts)
+        for batch in self.batches(texts):
+            encoded = self.tokenizer(
+                [texts[i] for i in batch],
+                return_tensors="pt",
+                padding=True,
+                truncation=True,
+                max_length=self.max_length
+            )
+            with self.torch.inference_mode():
+                generated = self.model.generate(**encoded, **generate_kwargs)
+            for i, translation in zip(batch, self.tokenizer.batch_decode(generated, skip_special_tokens=True)):
+                translations[i] = translation
+        return translations
+
+    def translate_many(
+        self, texts: List[str], sources: List[str], target: str = "en"
+    ) -> List[Tuple[Optional[str], Optional[str]]]:
+        """Translate texts of any source language, returning (translation, None) or (None, error) per text."""
+        by_source = {}
+        for i, source in enumerate(sources):
+            by_source.setdefault(source, []).append(i)
+
+        results = [(None, None)] * len(texts)
+        for source, positions in by_source.items():
+            if not source or not self.supports(source):
+                for i in positions:
+                    results[i] = (None, f"Unsupported source language: {source}")
+                continue
+            try:
+                translations = self.translate([texts[i] for i in positions], source, target)
+                for i, translation in zip(positions, translations):
+                    results[i] = (translation, None)
+            except Exception as e:
+                for i in positions:
+                    results[i] = (None, f"{type(e).__name__}: {e}")
+        return results
+
+
+@lru_cache(maxsize=2)
+def load_offline_translator(model_name: str = OFFLINE_MODEL, num_threads: int = None, quantize: bool = True) -> OfflineTranslator:
+    """Load an OfflineTranslator once per process and configuration."""
+    return OfflineTranslator(model_name, num_threads=num_threads, quantize=quantize)
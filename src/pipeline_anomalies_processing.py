@@ -1,18 +1,38 @@
+import numpy as np
 import polars as pl
 import re
+from functools import lru_cache
 from num2words import num2words
-import langid
 import concurrent
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from tqdm import tqdm
-from deep_translator import GoogleTranslator
-from spellchecker import SpellChecker
-from symspellpy.symspellpy import SymSpell, Verbosity
 import os
 from dotenv import load_dotenv
 import logging
 import argparse
 
+try:
+    from .translation_cache import DEFAULT_SIZE_LIMIT, TranslationCache, normalize_text
+except ImportError:
+    from translation_cache import DEFAULT_SIZE_LIMIT, TranslationCache, normalize_text
+
+try:
+    from .spelling_correction import SpellingCorrector, build_spelling_artifact, load_spelling_artifact, proper_nouns
+except ImportError:
+    from spelling_correction import SpellingCorrector, build_spelling_artifact, load_spelling_artifact, proper_nouns
+
+try:
+    from .near_duplicates import estimated_similarity, minhash_signatures, near_duplicate_clusters
+except ImportError:
+    from near_duplicates import estimated_similarity, minhash_signatures, near_duplicate_clusters
+
+try:
+    from .pipeline_checkpoint import StageCheckpoints
+except ImportError:
+    from pipeline_checkpoint import StageCheckpoints
+
+logger = logging.getLogger(__name__)
+
 def clean_missing_values(df: pl.DataFrame, column_name: str) -> tuple[pl.DataFrame, int]:
     """
     Remove rows from a DataFrame where the specified column has missing values,
@@ -56,10 +76,66 @@ def remove_duplicates(df: pl.DataFrame, subset_columns: list) -> tuple[pl.DataFr
 
     return df_clean, nb_duplicates
 
-def remove_special_characters(df: pl.DataFrame, column_name: str, keep: str = "") -> pl.DataFrame:
+def remove_near_duplicates(
+    df: pl.DataFrame,
+    column_name: str,
+    id_col: str = "id",
+    threshold: float = 0.8,
+    num_perm: int = 128,
+    shingle_size: int = 5
+) -> tuple[pl.DataFrame, pl.DataFrame]:
+    """
+    Remove reviews that are near-duplicates of an earlier review, e.g. reposts differing
+    only by whitespace, punctuation or a trailing signature.
+
+    Texts are compared on their character shingles (after lowercasing and removing the
+    punctuation) with MinHash signatures and LSH banding, see `near_duplicates`, so
+    candidate pairs are found without comparing every pair of reviews.
+
+    Args:
+        df (pl.DataFrame): Input DataFrame.
+        column_name (str): Name of the text column to compare.
+        id_col (str): Column identifying the reviews in the mapping table, the row
+            position ("row_nr") is used when the DataFrame has no such column.
+        threshold (float): Estimated Jaccard similarity above which two reviews are duplicates.
+        num_perm (int): Number of MinHash permutations.
+        shingle_size (int): Number of characters per shingle.
+
+    Returns:
+        tuple[pl.DataFrame, pl.DataFrame]:
+            - DataFrame keeping the earliest review of each cluster.
+            - Mapping table of the dropped reviews: id_col, "duplicate_of" (id of the
+              review kept) and "similarity" (estimated Jaccard similarity to it).
     """
+    if id_col not in df.columns:
+        id_col = "row_nr"
+        ids = pl.Series(id_col, range(df.height))
+    else:
+        ids = df[id_col]
+
+    signatures, has_shingles = minhash_signatures(df[column_name], num_perm, shingle_size)
+    representatives = near_duplicate_clusters(signatures, has_shingles, threshold)
+
+    positions = np.arange(df.height)
+    dropped = positions[representatives != positions]
+    mapping = pl.DataFrame({
+        id_col: ids.gather(dropped),
+        "duplicate_of": ids.gather(representatives[dropped]),
+        "similarity": estimated_similarity(signatures, dropped, representatives[dropped])
+    })
+
+    return df.filter(pl.Series(representatives == positions)), mapping
+
+def remove_special_characters(df: pl.DataFrame, column_name: str, keep: str = "") -> pl.DataFrame:
+    r"""
     Remove special characters from a specified text column using regex.
 
+    The cleaning runs as native Polars expressions (multithreaded, no Python call per row).
+    Polars uses the Rust regex engine, whose `\w`, `\s` and `\S` differ from Python's on
+    a few Unicode characters, so the classes are spelled out to keep the historical output.
+    The `\b` of the email pattern cannot be spelled out: the rare rows holding both an "@"
+    and a non-ASCII character (where both engines may disagree) go through Python's `re`.
+
     Args:
         df (pl.DataFrame): Input Polars DataFrame.
         column_name (str): Name of the text column to clean.
@@ -69,164 +145,584 @@ def remove_special_characters(df: pl.DataFrame, column_name: str, keep: str = ""
         pl.DataFrame: New DataFrame with cleaned text in the specified column.
     """
 
+    # Python's \s also matches the \x1c-\x1f separators, Rust's does not
+    space = r"\s\x1c-\x1f"
 
     # Pattern to remove emails
     email_pattern = r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b"
 
-    # Pattern to remove unwanted characters
-    chars_pattern = rf"[^\w\s{re.escape(keep)}]"
+    # Pattern to remove unwanted characters (Python's \w is letters, numbers and underscore)
+    chars_pattern = rf"[^\p{{L}}\p{{N}}_{space}{re.escape(keep)}]"
 
     # Pattern to remove hashtags (#word)
-    hashtag_pattern = r"#\S+"
+    hashtag_pattern = rf"#[^{space}]+"
 
     # Pattern to replace apostrophes with a space
     apostrophe_pattern = r"[’']"
 
     # Pattern to remove url
-    url_pattern = r"https?://\S+|www\.\S+"
+    url_pattern = rf"https?://[^{space}]+|www\.[^{space}]+"
+
+    text = pl.col(column_name)
+
+    # 1. Remove emails (map_elements skips the nulls, i.e. every row but the ambiguous ones)
+    email_regex = re.compile(email_pattern)
+    ambiguous = text.str.contains("@", literal=True) & text.str.contains(r"[^\x00-\x7F]")
+    no_emails = pl.coalesce(
+        pl.when(ambiguous).then(text).map_elements(lambda t: email_regex.sub("", t), return_dtype=pl.Utf8),
+        text.str.replace_all(email_pattern, "")
+    )
 
-    def clean_text(text):
-        # 1. Remove emails
-        text = re.sub(email_pattern, "", text)
+    df_cleaned = df.with_columns(
+        no_emails
         # 2. Remove URLs
-        text = re.sub(url_pattern, "", text)
+        .str.replace_all(url_pattern, "")
         # 3. Remove hashtags
-        text = re.sub(hashtag_pattern, "", text)
+        .str.replace_all(hashtag_pattern, "")
         # 4. Replace apostrophes with a space
-        text = re.sub(apostrophe_pattern, " ", text)
+        .str.replace_all(apostrophe_pattern, " ")
         # 5. Remove unwanted characters
-        text = re.sub(chars_pattern, "", text)
+        .str.replace_all(chars_pattern, "")
         # 6. Clean multiple spaces
-        text = re.sub(r"\s+", " ", text).strip()
-        return text
-
-    df_cleaned = df.with_columns(
-        pl.col(column_name).map_elements(clean_text).alias(column_name)
+        .str.replace_all(rf"[{space}]+", " ")
+        .str.strip_chars(" ")
+        .alias(column_name)
     )
 
     return df_cleaned
 
-def numbers_to_words(df: pl.DataFrame, column_name: str) -> pl.DataFrame:
+# Bound of the number -> words memo, the same few hundred numbers make most occurrences
+NUMBER_CACHE_SIZE = 4096
+
+@lru_cache(maxsize=NUMBER_CACHE_SIZE)
+def number_to_words(digits: str) -> str:
+    """
+    Spell a run of digits with num2words. Integers beyond what num2words (or int()) accepts,
+    e.g. pasted ids of hundreds of digits, are spelled digit by digit instead of failing.
+    """
+    try:
+        return num2words(int(digits))
+    except (OverflowError, ValueError):
+        return " ".join(num2words(int(digit)) for digit in digits)
+
+def numbers_to_words(df: pl.DataFrame, column_name: str, mode: str = "vectorized") -> tuple[pl.DataFrame, int]:
     """
     Convert all numbers in a text column into words using num2words.
 
     Args:
         df (pl.DataFrame): Input DataFrame.
         column_name (str): Name of the text column to process.
-        lang (str): Language code (e.g., 'en' or 'fr').
+        mode (str): "vectorized" only sends the rows containing a digit to Python and
+            memoizes the spelled numbers (see `number_to_words`), "rows" is the historical
+            conversion of every row. Both give the same output.
 
     Returns:
-        pl.DataFrame: New DataFrame with numbers replaced by words.
+        tuple[pl.DataFrame, int]: New DataFrame with numbers replaced by words and number
+        of numbers converted.
     """
     def convert_numbers(text: str) -> str:
         if not isinstance(text, str) or not text.strip():
             return text
 
         def replace_number(m):
-            num_text = num2words(int(m.group()))
+            num_text = number_to_words(m.group())
             left = ' ' if m.start() > 0 and text[m.start()-1].isalnum() else ''
             right = ' ' if m.end() < len(text) and text[m.end():m.end()+1].isalnum() else ''
             return f"{left}{num_text}{right}"
 
         return re.sub(r'\d+', replace_number, text)
 
-    df_converted = df.with_columns(
-        pl.col(column_name).map_elements(convert_numbers).alias(column_name)
-    )
+    text = pl.col(column_name)
+    nb_numbers = df.select(text.str.count_matches(r"\d+").sum()).item() or 0
 
-    return df_converted
+    if mode == "vectorized":
+        # map_elements skips nulls, so the rows without any digit never reach Python
+        converted = pl.coalesce(
+            pl.when(text.str.contains(r"\d")).then(text).map_elements(convert_numbers, return_dtype=pl.Utf8),
+            text
+        )
+    elif mode == "rows":
+        converted = text.map_elements(convert_numbers, return_dtype=pl.Utf8)
+    else:
+        raise ValueError(f"Unknown numbers_to_words mode: {mode}")
 
-def detect_language_parallel(df: pl.DataFrame, column_name: str, num_threads: int = 4) -> tuple[pl.DataFrame, int]:
+    df_converted = df.with_columns(converted.alias(column_name))
+
+    return df_converted, nb_numbers
+
+# Language identification backends usable by detect_language_parallel
+LANGUAGE_BACKENDS = ("langid", "fasttext")
+
+# fastText LID model (lid.176.bin or the compressed lid.176.ftz from fasttext.cc)
+FASTTEXT_LID_MODEL = "../models/lid.176.bin"
+
+def load_language_detector(backend: str = "langid", model_path: str = None):
     """
-    Detect the language of a text column in a Polars DataFrame using langid in parallel.
+    Load a language identification backend and return a function mapping a batch of
+    texts to (language code, confidence in [0, 1]) pairs.
+
+    Args:
+        backend (str): "langid" (normalized probabilities) or "fasttext" (fastText LID).
+        model_path (str): fastText model file, FASTTEXT_LID_MODEL by default.
+    """
+    if backend == "langid":
+        from langid.langid import LanguageIdentifier, model
+        identifier = LanguageIdentifier.from_modelstring(model, norm_probs=True)
+
+        def detect(texts: list[str]) -> list[tuple[str, float]]:
+            return [identifier.classify(text) for text in texts]
+
+    elif backend == "fasttext":
+        import fasttext
+        lid_model = fasttext.load_model(model_path or FASTTEXT_LID_MODEL)
+
+        def detect(texts: list[str]) -> list[tuple[str, float]]:
+            # fastText predicts one line per text
+            labels, probs = lid_model.predict([text.replace("\n", " ") for text in texts], k=1)
+            return [
+                (label[0].replace("__label__", ""), min(float(prob[0]), 1.0))
+                for label, prob in zip(labels, probs)
+            ]
+
+    else:
+        raise ValueError(f"Unknown language detection backend: {backend}")
+
+    return detect
+
+# Detector loaded once per worker process by `_init_language_worker`
+_worker_detector = None
+
+def _init_language_worker(backend: str, model_path: str = None):
+    global _worker_detector
+    _worker_detector = load_language_detector(backend, model_path)
+
+def _detect_language_chunk(texts: list) -> list[tuple]:
+    """Detect the language of a batch of texts in a worker, (None, None) for empty texts."""
+    results = [(None, None)] * len(texts)
+    positions = [i for i, text in enumerate(texts) if isinstance(text, str) and text.strip()]
+    for i, detected in zip(positions, _worker_detector([texts[i] for i in positions])):
+        results[i] = detected
+    return results
+
+def detect_language_parallel(
+    df: pl.DataFrame,
+    column_name: str,
+    num_threads: int = 4,
+    backend: str = "langid",
+    batch_size: int = 1000,
+    model_path: str = None
+) -> tuple[pl.DataFrame, int]:
+    """
+    Detect the language of a text column in a Polars DataFrame in parallel.
+
+    Texts are sent in batches to a process pool (language identification is CPU bound,
+    threads would contend for the GIL) where the backend model is loaded once per worker.
 
     Args:
         df (pl.DataFrame): Input DataFrame.
         column_name (str): Name of the text column to process.
-        num_threads (int): Number of threads to use for parallel processing (default=4).
+        num_threads (int): Number of worker processes (default=4), 1 runs in-process.
+        backend (str): Language identification backend, see LANGUAGE_BACKENDS.
+        batch_size (int): Number of texts sent to a worker at once.
+        model_path (str): Model file of the "fasttext" backend.
 
     Returns:
         tuple[pl.DataFrame, int]: 
-            - DataFrame with an added column 'detected_lang' containing language codes.
+            - DataFrame with added columns 'detected_lang' containing language codes
+              and 'detected_lang_conf' containing the detection confidence.
             - Number of sentences not detected as English ('en').
     """
-    def detect_lang(text: str) -> str:
-        """Return the language code of a single text using langid."""
-        if not isinstance(text, str) or not text.strip():
-            return None
-        lang, _ = langid.classify(text)
-        return lang
+    if backend not in LANGUAGE_BACKENDS:
+        raise ValueError(f"Unknown language detection backend: {backend}")
 
-    # Convert the Polars column to a Python list
+    # Convert the Polars column to batches of a Python list
     texts = df[column_name].to_list()
-
-    # Parallel processing with ThreadPoolExecutor
-    all_langs = []
-    with ThreadPoolExecutor(max_workers=num_threads) as executor:
-        for result in tqdm(executor.map(detect_lang, texts), total=len(texts), desc="Language detection"):
-            all_langs.append(result)
-
-    # Return new DataFrame with added column
-    df_result = df.with_columns(pl.Series("detected_lang", all_langs))
+    chunks = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+
+    # Batches are consumed in submission order, which keeps the row order
+    if num_threads > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(
+            max_workers=num_threads,
+            initializer=_init_language_worker,
+            initargs=(backend, model_path)
+        ) as executor:
+            results = list(tqdm(executor.map(_detect_language_chunk, chunks), total=len(chunks), desc="Language detection"))
+    else:
+        _init_language_worker(backend, model_path)
+        results = [_detect_language_chunk(chunk) for chunk in tqdm(chunks, desc="Language detection")]
+
+    all_langs = [lang for chunk in results for lang, _ in chunk]
+    all_confs = [conf for chunk in results for _, conf in chunk]
+
+    # Return new DataFrame with added columns
+    df_result = df.with_columns(
+        pl.Series("detected_lang", all_langs, dtype=pl.Utf8),
+        pl.Series("detected_lang_conf", all_confs, dtype=pl.Float64)
+    )
 
     nb_non_english = sum(lang != "en" for lang in all_langs if lang is not None)
 
     return df_result,nb_non_english
 
+# Frequent English function words, an English text holds a lot of them. Short words that
+# are also common in other languages ("a", "no", "me", "in", "so", "was", "die"...) are left out
+ENGLISH_MARKERS = frozenset(
+    "about after also and any are because been being but can could did does doing from had has "
+    "have having here him his how into its just more most not only other our ours should some "
+    "than that the their them then there these they this those very were what when where which "
+    "while who why with would you your".split()
+)
+
+# Words counted by the English function words heuristic
+WORD_PATTERN = re.compile(r"[A-Za-z']+")
+
+def looks_english(text: str, english_ratio: float = 0.3, min_markers: int = 2) -> bool:
+    """Tell whether at least min_markers words, and english_ratio of the words, are English function words."""
+    words = WORD_PATTERN.findall(text.lower())
+    markers = sum(word in ENGLISH_MARKERS for word in words)
+    return markers >= min_markers and markers / len(words) >= english_ratio
+
+def translation_skip_reason(
+    text: str,
+    confidence: float = None,
+    min_confidence: float = 0.5,
+    min_length: int = 20,
+    short_confidence: float = 0.95,
+    english_ratio: float = 0.3
+) -> str:
+    """
+    Decide whether a review detected as non-English really needs a translator call.
+    Only ASCII texts can be skipped, a text with accents or another script is always translated.
+
+    Args:
+        text (str): Review text.
+        confidence (float): Detection confidence in [0, 1] ('detected_lang_conf'), None if unknown.
+        min_confidence (float): Below it, the detected language is a guess and the text is
+            only skipped when the English function words heuristic holds. A low confidence
+            alone is no reason to skip: short foreign reviews ("Ottimo") are often detected
+            with a low confidence too.
+        min_length (int): ASCII texts shorter than this and detected with less than
+            short_confidence are skipped when a single English function word is enough for
+            the heuristic ("short_text", e.g. "very clean").
+        english_ratio (float): Share of English function words from which an ASCII text
+            whose language is uncertain (confidence below min_confidence or unknown) is
+            considered English ("english_stopwords").
+
+    Returns:
+        str: The reason to skip the translation, None if the text must be translated.
+    """
+    if not text.isascii():
+        return None
+    uncertain = confidence is None or confidence < min_confidence
+    if uncertain and looks_english(text, english_ratio):
+        return "english_stopwords"
+    if (
+        len(text.strip()) < min_length
+        and (confidence is None or confidence < short_confidence)
+        and looks_english(text, english_ratio, min_markers=1)
+    ):
+        return "short_text"
+    return None
+
+# Translation backends usable by translate_non_english_threadsafe
+TRANSLATION_BACKENDS = ("google", "libretranslate", "offline")
+
 def translate_non_english_threadsafe(df: pl.DataFrame,
                                      column_name: str,
                                      detected_lang_col: str = "detected_lang",
-                                     num_threads: int = 4) -> pl.DataFrame:
+                                     num_threads: int = 4,
+                                     gate: bool = True,
+                                     cache_dir: str = "../data/cache/translations",
+                                     cache_size_limit: int = DEFAULT_SIZE_LIMIT,
+                                     backend: str = "google",
+                                     url: str = None,
+                                     rate: float = 5.0,
+                                     model_path: str = None,
+                                     quantize: bool = True) -> tuple[pl.DataFrame, int]:
     """
     Thread-safe translation: one translator per thread.
+
+    With gate=True, rows detected as non-English are only translated when
+    `translation_skip_reason` finds no reason to skip them, using the
+    '<detected_lang_col>_conf' confidence column when present.
+
+    Rows sharing the same normalized text and source language are translated once, and
+    translations are kept in a persistent TranslationCache (cache_dir, None to disable)
+    shared by every run and dataset. Failed translations are not cached.
+
+    backend="google" translates one text per call on num_threads threads, backend="libretranslate"
+    sends packed requests to the LibreTranslate-compatible endpoint `url` with an
+    AsyncTranslationClient (rate requests per second, num_threads requests in flight),
+    backend="offline" runs a local seq2seq model on CPU with an OfflineTranslator
+    (model_path, num_threads PyTorch threads, int8 dynamic quantization with quantize=True).
+
+    Failed rows keep their original text. The 'translation_status' column tells what happened
+    to each row: "translated", "cached", "skipped" (by the gate), "failed", or null when
+    no translation was needed.
+
+    Returns:
+        tuple[pl.DataFrame, int]: DataFrame with translated reviews and number of translator calls.
     """
-    def translate_one(text: str) -> str:
-        if not isinstance(text, str) or not text.strip():
-            return text
-        try:
-            translator = GoogleTranslator(source='auto', target='en')  # local traductor
-            return translator.translate(text)
-        except Exception as e:
-            return f"[ERROR: {e}]"
+    if backend not in TRANSLATION_BACKENDS:
+        raise ValueError(f"Unknown translation backend: {backend}")
+    if backend == "libretranslate" and not url:
+        raise ValueError("The libretranslate backend needs the url of its /translate endpoint")
+
+    texts = df[column_name].to_list()
+    langs = df[detected_lang_col].to_list()
+    confidence_col = f"{detected_lang_col}_conf"
+    confidences = df[confidence_col].to_list() if confidence_col in df.columns else [None] * df.height
+    statuses = [None] * df.height
 
     indices_to_translate = []
-    texts_to_translate = []
-    for i, (text, lang) in enumerate(zip(df[column_name].to_list(), df[detected_lang_col].to_list())):
+    skipped = {}
+    for i, (text, lang, confidence) in enumerate(zip(texts, langs, confidences)):
         if lang != 'en':
+            if not isinstance(text, str) or not text.strip():
+                continue
+            reason = translation_skip_reason(text, confidence) if gate else None
+            if reason is not None:
+                skipped[reason] = skipped.get(reason, 0) + 1
+                statuses[i] = "skipped"
+                logger.debug(f"Row {i} ({lang}, confidence {confidence}) not translated: {reason}")
+                continue
             indices_to_translate.append(i)
-            texts_to_translate.append(text)
 
-    translated_texts = df[column_name].to_list()
+    if gate:
+        details = ", ".join(f"{nb} {reason}" for reason, nb in skipped.items()) or "none"
+        logger.info(f"Translation gate avoided {sum(skipped.values())} translator calls ({details})")
+
+    # Deduplicate: one translation per (normalized text, source language)
+    groups = {}
+    for idx in indices_to_translate:
+        groups.setdefault((normalize_text(texts[idx]), langs[idx]), []).append(idx)
+    unique_items = list(groups)
+
+    # Offline translations depend on the model and its precision
+    # Translations of different endpoints or models never share cache entries
+    if backend == "offline":
+        cache_backend = f"offline:{model_path or 'default'}:{'int8' if quantize else 'fp32'}"
+    elif backend == "libretranslate":
+        cache_backend = f"libretranslate:{url}"
+    else:
+        cache_backend = backend
+    cache = TranslationCache(cache_dir, cache_backend, "en", cache_size_limit) if cache_dir else None
+    cached = cache.get_many(unique_items) if cache else [None] * len(unique_items)
+    translations = {item: (translation, "cached") for item, translation in zip(unique_items, cached) if translation is not None}
+    items_to_translate = [item for item, translation in zip(unique_items, cached) if translation is None]
+
+    if backend == "google":
+        # Imported on first use: deep_translator pulls requests and BeautifulSoup in
+        from deep_translator import GoogleTranslator
+
+        def translate_one(text: str) -> tuple[str, str]:
+            """Return (translation, None), or (None, error) when the call failed."""
+            try:
+                translator = GoogleTranslator(source='auto', target='en')  # local traductor
+                return translator.translate(text), None
+            except Exception as e:
+                return None, f"{type(e).__name__}: {e}"
+
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            results = list(tqdm(executor.map(translate_one, [text for text, _ in items_to_translate]),
+                                total=len(items_to_translate),
+                                desc="Translating non-English reviews"))
+    elif backend == "offline":
+        try:
+            from .offline_translation import OFFLINE_MODEL, load_offline_translator
+        except ImportError:
+            from offline_translation import OFFLINE_MODEL, load_offline_translator
+        translator = load_offline_translator(model_path or OFFLINE_MODEL, num_threads, quantize)
+        results = translator.translate_many([text for text, _ in items_to_translate], [lang for _, lang in items_to_translate])
+    else:
+        try:
+            from .async_translation import AsyncTranslationClient
+        except ImportError:
+            from async_translation import AsyncTranslationClient
+        client = AsyncTranslationClient(url, rate=rate, max_concurrency=num_threads)
+        results = client.translate_many([text for text, _ in items_to_translate], [lang for _, lang in items_to_translate])
+        logger.info(f"{client.requests} requests sent to {url} ({client.retries} retries)")
+
+    new_entries = []
+    errors = {}
+    for item, (translation, error) in zip(items_to_translate, results):
+        if error is None:
+            translations[item] = (translation, "translated")
+            new_entries.append((*item, translation))
+        else:
+            translations[item] = (None, "failed")
+            errors[error] = errors.get(error, 0) + 1
+
+    # Write every translation back to all the rows sharing the text
+    translated_texts = list(texts)
+    for item, indices in groups.items():
+        translation, status = translations[item]
+        for idx in indices:
+            statuses[idx] = status
+            if translation is not None:
+                translated_texts[idx] = translation
+
+    logger.info(
+        f"{len(indices_to_translate)} reviews to translate: {len(unique_items)} distinct texts, "
+        f"{len(unique_items) - len(items_to_translate)} from the cache, {len(items_to_translate)} translated"
+    )
+    if errors:
+        details = "; ".join(f"{nb}x {error}" for error, nb in sorted(errors.items(), key=lambda e: -e[1])[:5])
+        logger.warning(f"{sum(errors.values())} translations failed, original text kept: {details}")
+    if cache:
+        cache.set_many(new_entries)
+        stats = cache.stats()
+        logger.info(
+            f"Translation cache: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['hit_rate']:.1%} hit rate), {stats['size_bytes'] / 2**20:.1f} MiB on disk"
+        )
+        cache.close()
+
+    return df.with_columns(
+        pl.Series(column_name, translated_texts),
+        pl.Series("translation_status", statuses, dtype=pl.Utf8)
+    ), len(items_to_translate)
+
+def translation_complete(df: pl.DataFrame) -> bool:
+    """Tell whether no row of a translated DataFrame has a failed translation."""
+    return not (df["translation_status"] == "failed").any()
+
+# Spelling corrector loaded once per worker process by `_init_spelling_worker`
+_worker_corrector = None
+
+def _init_spelling_worker(max_edit_distance: int, artifact_dir: str, corpus_proper_nouns: frozenset = None):
+    global _worker_corrector
+    artifact = load_spelling_artifact(max_edit_distance=max_edit_distance, artifact_dir=artifact_dir)
+    _worker_corrector = SpellingCorrector(artifact["sym_spell"], max_edit_distance, corpus_proper_nouns)
+
+def _correct_spelling_chunk(texts: list) -> tuple[list, int]:
+    """Correct a batch of texts in a worker, returning them with the number of corrected words."""
+    corrected = _worker_corrector.corrected
+    results = [_worker_corrector.correct(text) for text in texts]
+    return results, _worker_corrector.corrected - corrected
+
+def correct_spelling(
+    df: pl.DataFrame,
+    column_name: str,
+    num_threads: int = 4,
+    batch_size: int = 10000,
+    max_edit_distance: int = 2,
+    artifact_dir: str = "../data/cache/spelling"
+) -> tuple[pl.DataFrame, int]:
+    """
+    Correct misspelled words of a text column with SymSpell compound lookup.
 
-    with ThreadPoolExecutor(max_workers=num_threads) as executor:
-        for idx, translation in zip(
-            indices_to_translate,
-            tqdm(executor.map(translate_one, texts_to_translate),
-                 total=len(texts_to_translate),
-                 desc="Translating non-English reviews")
-        ):
-            translated_texts[idx] = translation
+    The SymSpell index (English frequency dictionaries plus the words of the keyword
+    dictionaries) is compiled once into a pickled artifact (see `load_spelling_artifact`)
+    that every worker process loads at start-up. Corrections are memoized per word in
+    each worker, so only the distinct unknown words reach SymSpell.
+
+    The column has lost its punctuation by then, so proper nouns (kept as they are) are
+    the words written capitalized through the whole column (see `proper_nouns`), not the
+    capitalized words inside a sentence.
+
+    Args:
+        df (pl.DataFrame): Input DataFrame.
+        column_name (str): Name of the text column to process.
+        num_threads (int): Number of worker processes (default=4), 1 runs in-process.
+        batch_size (int): Number of texts sent to a worker at once.
+        max_edit_distance (int): Maximum edit distance of a correction.
+        artifact_dir (str): Directory of the compiled SymSpell artifact.
 
-    return df.with_columns(pl.Series(column_name, translated_texts))
+    Returns:
+        tuple[pl.DataFrame, int]: DataFrame with the corrected column and number of
+        words corrected.
+    """
+    # Compile the artifact once before the workers start loading it
+    build_spelling_artifact(max_edit_distance=max_edit_distance, artifact_dir=artifact_dir)
 
-def preprocess_pipeline(input_csv: str, column_name: str, output_csv: str):
+    corpus_proper_nouns = proper_nouns(df[column_name])
+    texts = df[column_name].to_list()
+    chunks = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+
+    # Batches are consumed in submission order, which keeps the row order
+    if num_threads > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(
+            max_workers=num_threads,
+            initializer=_init_spelling_worker,
+            initargs=(max_edit_distance, artifact_dir, corpus_proper_nouns)
+        ) as executor:
+            results = list(tqdm(executor.map(_correct_spelling_chunk, chunks), total=len(chunks), desc="Spelling correction"))
+    else:
+        _init_spelling_worker(max_edit_distance, artifact_dir, corpus_proper_nouns)
+        results = [_correct_spelling_chunk(chunk) for chunk in tqdm(chunks, desc="Spelling correction")]
+
+    corrected_texts = [text for chunk, _ in results for text in chunk]
+    nb_corrected = sum(nb for _, nb in results)
+
+    return df.with_columns(pl.Series(column_name, corrected_texts, dtype=pl.Utf8)), nb_corrected
+
+# Modules whose code determines the output of the pipeline stages (part of the checkpoint keys)
+PIPELINE_MODULES = ("pipeline_anomalies_processing.py", "disk_cache.py", "translation_cache.py", "async_translation.py",
+                    "offline_translation.py", "spelling_correction.py", "near_duplicates.py")
+
+# Rows translated between two commits of the translation checkpoint
+TRANSLATION_CHECKPOINT_ROWS = 5000
+
+def preprocess_pipeline(input_csv: str, column_name: str, output_csv: str, lang_backend: str = "langid",
+                        translation_backend: str = "google", translation_url: str = None, spelling: bool = False,
+                        near_duplicate_threshold: float = None, checkpoint_dir: str = None):
     """
     Apply the full preprocessing pipeline to the given CSV file.
+    Spelling correction (see `correct_spelling`) only runs with spelling=True, near-duplicate
+    removal (see `remove_near_duplicates`) only when near_duplicate_threshold is given, its
+    mapping table is then saved next to output_csv with a "_near_duplicates" suffix.
+
+    With checkpoint_dir, every stage saves its output there (see `StageCheckpoints`): a new
+    run on the same input with the same parameters and code skips the completed stages and
+    resumes the translation after its last committed batch of TRANSLATION_CHECKPOINT_ROWS rows.
+    Batches holding failed translations are not committed: the next run translates them again.
     """
+    def count_numbers(df):
+        df,nb_numbers = numbers_to_words(df, column_name)
+        cache = number_to_words.cache_info()
+        return df, [nb_numbers, cache.hits, cache.misses]
+
+    code_paths = [os.path.join(os.path.dirname(os.path.abspath(__file__)), module) for module in PIPELINE_MODULES]
+    checkpoints = StageCheckpoints(checkpoint_dir, input_csv, code_paths)
+
     df = pl.read_csv(input_csv)
     logger.info(f"DataFrame {os.path.splitext(os.path.basename(input_csv))[0]} loaded : {df.shape[0]} rows x {df.shape[1]} columns")
-    df,nb_missing_values = clean_missing_values(df, column_name)
+    df,nb_missing_values = checkpoints.run("missing_values", {"col": column_name},
+                                           lambda df: clean_missing_values(df, column_name), df)
     logger.info(f"{nb_missing_values} missing reviews detected and cleaned.")
-    df,nb_duplicates = remove_duplicates(df, column_name)
+    df,nb_duplicates = checkpoints.run("duplicates", {"col": column_name},
+                                       lambda df: remove_duplicates(df, column_name), df)
     logger.info(f"{nb_duplicates} duplicated reviews detected and cleaned.")
-    df = numbers_to_words(df, column_name)
-    logger.info(f"Numerical numbers converted to string numbers.")
-    df = remove_special_characters(df, column_name)
+    if near_duplicate_threshold is not None:
+        df,near_duplicates = checkpoints.run(
+            "near_duplicates", {"col": column_name, "threshold": near_duplicate_threshold},
+            lambda df: remove_near_duplicates(df, column_name, threshold=near_duplicate_threshold), df
+        )
+        mapping_csv = f"{os.path.splitext(output_csv)[0]}_near_duplicates.csv"
+        near_duplicates.write_csv(mapping_csv)
+        logger.info(f"{near_duplicates.height} near-duplicated reviews detected and cleaned (mapping saved at {mapping_csv}).")
+    df,(nb_numbers,nb_memoized,nb_spelled) = checkpoints.run("numbers", {"col": column_name}, count_numbers, df)
+    logger.info(f"{nb_numbers} numerical numbers converted to string numbers ({nb_memoized} memoized, {nb_spelled} spelled).")
+    df,_ = checkpoints.run("special_characters", {"col": column_name},
+                           lambda df: (remove_special_characters(df, column_name), None), df)
     logger.info(f" Special characters removed.")
-    df,nb_to_translate = detect_language_parallel(df, column_name, NUM_THREAD)
+    df,nb_to_translate = checkpoints.run(
+        "language", {"col": column_name, "backend": lang_backend},
+        lambda df: detect_language_parallel(df, column_name, NUM_THREAD, backend=lang_backend), df
+    )
     logger.info(f"{nb_to_translate} reviews are potentially not in english.")
-    df = translate_non_english_threadsafe(df, column_name, "detected_lang", NUM_THREAD)
-    logger.info(f"{nb_to_translate} have been translated in english.")
+    df,nb_translated = checkpoints.run_batched(
+        "translation", {"col": column_name, "backend": translation_backend, "url": translation_url},
+        lambda df: translate_non_english_threadsafe(df, column_name, "detected_lang", NUM_THREAD,
+                                                    backend=translation_backend, url=translation_url),
+        df, TRANSLATION_CHECKPOINT_ROWS, complete=translation_complete
+    )
+    logger.info(f"{nb_translated} have been translated in english.")
+    if spelling:
+        df,nb_corrected = checkpoints.run("spelling", {"col": column_name},
+                                          lambda df: correct_spelling(df, column_name, NUM_THREAD), df)
+        logger.info(f"{nb_corrected} misspelled words corrected.")
     df.write_csv(output_csv)
     logger.info(f"Cleaned Dataframe saved at {output_csv}")
 
@@ -240,6 +736,7 @@ if __name__ == "__main__":
     logger = logging.getLogger(__name__)
     logging.getLogger("langid").setLevel(logging.WARNING)
     logging.getLogger("transformers").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
 
     # Parse parameters
     parser = argparse.ArgumentParser(prog="pipeline_anomalies_processing.py", 
@@ -263,6 +760,43 @@ if __name__ == "__main__":
         required=True,
         help="It is the path of your output dataset."
     )
+    parser.add_argument(
+        "--lang_backend",
+        type=str,
+        choices=LANGUAGE_BACKENDS,
+        default="langid",
+        help="It is the language detection backend (fasttext needs the lid.176 model in ../models)."
+    )
+    parser.add_argument(
+        "--translation_backend",
+        type=str,
+        choices=TRANSLATION_BACKENDS,
+        default="google",
+        help="It is the translation backend (libretranslate needs --translation_url, offline the m2m100_418M model in ../m2m100_418M)."
+    )
+    parser.add_argument(
+        "--translation_url",
+        type=str,
+        default=None,
+        help="It is the url of the LibreTranslate-compatible /translate endpoint (e.g. translation_stub_server.py)."
+    )
+    parser.add_argument(
+        "--spelling",
+        action="store_true",
+        help="It enables the SymSpell spelling correction of the reviews (after translation)."
+    )
+    parser.add_argument(
+        "--near_duplicate_threshold",
+        type=float,
+        default=None,
+        help="It enables the near-duplicate removal, reviews whose estimated Jaccard similarity exceeds it are dropped (e.g. 0.8)."
+    )
+    parser.add_argument(
+        "--checkpoint_dir",
+        type=str,
+        default="../data/cache/checkpoints",
+        help="It is the directory of the stage checkpoints used to resume an interrupted run (empty string to disable)."
+    )
     args = parser.parse_args()
     logger.info("Parameters loaded with sucess.")
 
@@ -272,4 +806,6 @@ if __name__ == "__main__":
     logger.info(f"NUM_THREAD fixed to {NUM_THREAD}")
 
     # Running the complete pipeline
-    preprocess_pipeline(args.origin_path,args.col,args.output_path)
\ No newline at end of file
+    preprocess_pipeline(args.origin_path,args.col,args.output_path,args.lang_backend,
+                        args.translation_backend,args.translation_url,args.spelling,
+                        args.near_duplicate_threshold,args.checkpoint_dir or None)
\ No newline at end of file
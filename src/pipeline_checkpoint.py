@@ -0,0 +1,176 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+from typing import Any, Callable, Iterable, Tuple
+
+import polars as pl
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of the checkpoints changes
+CHECKPOINT_VERSION = 2
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file, read by chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def code_version(paths: Iterable[str]) -> str:
+    """Hash of the source files implementing the stages: editing any of them invalidates the checkpoints."""
+    digest = hashlib.sha256(f"v{CHECKPOINT_VERSION}".encode("utf-8"))
+    for path in sorted(paths):
+        digest.update(f"|{os.path.basename(path)}|{file_digest(path)}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _write_json(path: str, content: dict) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(content, f)
+    os.replace(tmp_path, path)
+
+
+def _write_parquet(df: pl.DataFrame, path: str) -> None:
+    tmp_path = f"{path}.tmp"
+    df.write_parquet(tmp_path)
+    os.replace(tmp_path, path)
+
+
+class StageCheckpoints:
+    """
+    Parquet checkpoints of the successive stages of a pipeline run.
+
+    The key of a stage chains the key of the previous stage with the stage name, its
+    parameters and the code version, the first key being the hash of the input file.
+    Changing the input, a parameter or the code of a stage therefore invalidates this
+    stage and every stage after it, while the stages before it are still restored.
+
+    A stage returns its DataFrame and a result (JSON-serializable value or DataFrame),
+    both saved as `<stage>-<key>.parquet` with a `.json` sidecar. Files are written
+    to a temporary path and renamed, so a crash never leaves a half-written checkpoint.
+    With directory=None nothing is saved and every stage runs.
+
+    Once a batched stage leaves batches uncommitted (see `run_batched`), the keys of the
+    following stages no longer describe their input: they run without being saved.
+    """
+
+    def __init__(self, directory: str, input_path: str, code_paths: Iterable[str] = ()):
+        self.directory = directory
+        self.incomplete = False
+        self.code_version = code_version(code_paths)
+        self.key = file_digest(input_path) if directory else ""
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _next_key(self, stage: str, params: dict) -> str:
+        self.key = hashlib.sha256(
+            f"{self.key}|{stage}|{json.dumps(params, sort_keys=True, default=str)}|{self.code_version}".encode("utf-8")
+        ).hexdigest()
+        return self.key
+
+    def _prefix(self, stage: str) -> str:
+        return os.path.join(self.directory, f"{stage}-{self.key[:16]}")
+
+    def _load(self, prefix: str) -> Tuple[pl.DataFrame, Any]:
+        with open(f"{prefix}.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        result = pl.read_parquet(f"{prefix}.result.parquet") if meta["result_is_frame"] else meta["result"]
+        return pl.read_parquet(f"{prefix}.parquet"), result
+
+    def _save(self, prefix: str, stage: str, df: pl.DataFrame, result: Any) -> None:
+        result_is_frame = isinstance(result, pl.DataFrame)
+        _write_parquet(df, f"{prefix}.parquet")
+        if result_is_frame:
+            _write_parquet(result, f"{prefix}.result.parquet")
+        # The sidecar is written last: it marks the checkpoint as complete
+        _write_json(f"{prefix}.json", {
+            "stage": stage,
+            "key": self.key,
+            "rows": df.height,
+            "result_is_frame": result_is_frame,
+            "result": None if result_is_frame else result
+        })
+
+    def run(self, stage: str, params: dict, fn: Callable[[pl.DataFrame], Tuple[pl.DataFrame, Any]],
+            df: pl.DataFrame) -> Tuple[pl.DataFrame, Any]:
+        """Run fn(df) -> (df, result), or restore its checkpoint when the stage already completed."""
+        if not self.directory or self.incomplete:
+            return fn(df)
+        self._next_key(stage, params)
+        prefix = self._prefix(stage)
+        if os.path.exists(f"{prefix}.json"):
+            logger.info(f"Stage {stage} restored from checkpoint {prefix}.parquet")
+            return self._load(prefix)
+
+        df, result = fn(df)
+        self._save(prefix, stage, df, result)
+        return df, result
+
+    def run_batched(self, stage: str, params: dict, fn: Callable[[pl.DataFrame], Tuple[pl.DataFrame, int]],
+                    df: pl.DataFrame, batch_rows: int = 5000,
+                    complete: Callable[[pl.DataFrame], bool] = None) -> Tuple[pl.DataFrame, int]:
+        """
+        Run fn on successive slices of batch_rows rows and commit each slice as a part,
+        summing the results. A rerun only runs the slices without a committed part; the
+        parts are merged into a regular stage checkpoint once every slice is committed.
+
+        A part for which complete(part) is False (e.g. rows whose translation failed) is
+        returned but not committed, so the next run processes its slice again.
+        """
+        if not self.directory or self.incomplete:
+            return fn(df)
+        self._next_key(stage, params)
+        prefix = self._prefix(stage)
+        if os.path.exists(f"{prefix}.json"):
+            logger.info(f"Stage {stage} restored from checkpoint {prefix}.parquet")
+            return self._load(prefix)
+
+        parts_dir = f"{prefix}.parts"
+        progress_path = os.path.join(parts_dir, "progress.json")
+        os.makedirs(parts_dir, exist_ok=True)
+        progress = {"batch_rows": batch_rows, "results": {}}
+        if os.path.exists(progress_path):
+            with open(progress_path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            # Parts of another batch size do not line up with the slices, start over
+            if saved["batch_rows"] == batch_rows:
+                progress = saved
+                logger.info(f"Stage {stage} resumed with {len(progress['results'])} committed batches")
+
+        parts, results = [], []
+        for n, start in enumerate(range(0, df.height, batch_rows)):
+            part_path = os.path.join(parts_dir, f"part-{n:05d}.parquet")
+            # JSON object keys are strings
+            if str(n) in progress["results"]:
+                parts.append(pl.read_parquet(part_path))
+                results.append(progress["results"][str(n)])
+                continue
+            part, result = fn(df.slice(start, batch_rows))
+            parts.append(part)
+            results.append(result)
+            if complete is not None and not complete(part):
+                logger.warning(f"Stage {stage}: batch {n} is incomplete and not committed, it will run again")
+                continue
+            _write_parquet(part, part_path)
+            progress["results"][str(n)] = result
+            _write_json(progress_path, progress)
+
+        df = pl.concat(parts) if parts else fn(df)[0]
+        result = sum(results)
+        if len(progress["results"]) < len(parts):
+            self.incomplete = True
+            logger.warning(
+                f"Stage {stage}: {len(parts) - len(progress['results'])} batches not committed, "
+                f"this stage and the next ones are not saved"
+            )
+            return df, result
+        self._save(prefix, stage, df, result)
+        shutil.rmtree(parts_dir)
+        return df, result
@@ -1,24 +1,79 @@
-import nltk
 import polars as pl
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
 import re
-import spacy
 from tqdm import tqdm
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List
 import concurrent.futures
+from collections import deque
+from functools import lru_cache
 import os
 from dotenv import load_dotenv
 import logging
 import json
+import random
+import time
+import hashlib
+import inspect
+import itertools
+import pickle
+from math import prod
+from importlib import metadata
 
-nltk.download("stopwords", quiet=True)
-nltk.download("punkt", quiet=True)
-#nltk.download('punkt_tab')
+try:
+    from .keyword_matcher import TOKEN_PATTERN, KeywordMatcher, merge_spans, normalize_keyword, overlaps, phrase_regex
+    from .lemma_cache import DEFAULT_SIZE_LIMIT, LemmaCache
+    from .keyword_index import InvertedIndex
+except ImportError:
+    from keyword_matcher import TOKEN_PATTERN, KeywordMatcher, merge_spans, normalize_keyword, overlaps, phrase_regex
+    from lemma_cache import DEFAULT_SIZE_LIMIT, LemmaCache
+    from keyword_index import InvertedIndex
+
+logger = logging.getLogger(__name__)
+
+# spaCy pipeline used for lemmatization (disable unnecessary components for faster performance)
+SPACY_MODEL = "en_core_web_sm"
+SPACY_DISABLE = ("ner", "parser")
 
 NEGATIONS = {"not", "no", "never", "none", "cannot", "can't", "don't", 
              "doesn't", "isn't", "wasn't", "weren't", "wouldn't", "shouldn't", "couldn't"}
 
+WORD_PATTERN = re.compile(r"^[A-Za-z-]+$")
+
+
+@lru_cache(maxsize=None)
+def ensure_nltk_data(resource: str, package: str) -> None:
+    """Download an NLTK resource the first time it is needed, instead of at import time."""
+    import nltk
+    try:
+        nltk.data.find(resource)
+    except LookupError:
+        nltk.download(package, quiet=True)
+
+
+@lru_cache(maxsize=1)
+def english_stopwords() -> frozenset:
+    """NLTK English stopwords, read once per process."""
+    ensure_nltk_data("corpora/stopwords", "stopwords")
+    from nltk.corpus import stopwords
+    return frozenset(stopwords.words("english"))
+
+
+@lru_cache(maxsize=1)
+def get_nlp():
+    """
+    Load the spaCy pipeline on first use and keep it for the life of the process.
+    Worker processes each load their own copy the first time they need it.
+    """
+    import spacy
+    return spacy.load(SPACY_MODEL, disable=list(SPACY_DISABLE))
+
+
+def keep_token(word: str) -> bool:
+    """
+    Token filter shared by the stopword removal stages: keep lowercase alphabetic words
+    (hyphens allowed) that are not stopwords, negations excepted.
+    """
+    return bool(WORD_PATTERN.match(word)) and (word not in english_stopwords() or word in NEGATIONS)
+
 
 def remove_stopwords(df: pl.DataFrame, column_name: str) -> pl.DataFrame:
     """
@@ -36,22 +91,30 @@ def remove_stopwords(df: pl.DataFrame, column_name: str) -> pl.DataFrame:
     pl.DataFrame
         A new DataFrame with stopwords removed from the specified column.
     """
-    stop_words = set(stopwords.words("english"))
+    ensure_nltk_data("tokenizers/punkt", "punkt")
+    from nltk.tokenize import word_tokenize
 
     def clean_text(text: str) -> str:
         if not isinstance(text, str):
             return text
         tokens = word_tokenize(text.lower())
-        filtered = [word for word in tokens if re.match(r"^[A-Za-z-]+$", word) 
-                    and (word not in stop_words or word in NEGATIONS)]
+        filtered = [word for word in tokens if keep_token(word)]
         return " ".join(filtered)
 
     return df.with_columns(
         pl.col(column_name).map_elements(clean_text, return_dtype=pl.Utf8).alias(column_name)
     )
 
-# Load SpaCy (disable unnecessary components for faster performance)
-nlp = spacy.load("en_core_web_sm", disable=["ner", "parser"])
+def clean_lemmas(lemmas: List[str]) -> str:
+    """
+    Join token lemmas and clean them for keyword matching.
+
+    Cleaning:
+    - Replace " - " with "-" to handle multi-word keywords like "pet-friendly".
+    - Strip leading/trailing whitespace.
+    """
+    return " ".join(lemmas).replace(" - ", "-").strip()
+
 
 def lemmatize_and_clean_texts(
     texts: List[str],
@@ -60,38 +123,333 @@ def lemmatize_and_clean_texts(
 ) -> List[str]:
     """
     Lemmatize a list of texts using spaCy with multiprocessing
-    and clean them for keyword matching.
-    
-    Cleaning:
-    - Replace " - " with "-" to handle multi-word keywords like "pet-friendly".
-    - Strip leading/trailing whitespace.
+    and clean them for keyword matching (see `clean_lemmas`).
     """
     clean_texts = [(t if isinstance(t, str) else "") for t in texts]
     lemmatized = []
-    for doc in nlp.pipe(clean_texts, batch_size=batch_size, n_process=n_process):
-        text = " ".join([token.lemma_ for token in doc])
-        text = text.replace(" - ", "-").strip()
-        lemmatized.append(text)
+    for doc in get_nlp().pipe(clean_texts, batch_size=batch_size, n_process=n_process):
+        lemmatized.append(clean_lemmas([token.lemma_ for token in doc]))
     return lemmatized
 
 
+def _lemmatize_in_worker(texts: List[str], batch_size: int, drop_stopwords: bool = False) -> List[List[str]]:
+    """
+    Return the token lemmas of each text, using the spaCy model of the current process.
+    With drop_stopwords, texts are lowercased and only the lemmas of tokens passing
+    `keep_token` are returned, so stopword removal and lemmatization share one tokenization.
+    """
+    nlp = get_nlp()
+    if not drop_stopwords:
+        return [[token.lemma_ for token in doc] for doc in nlp.pipe(texts, batch_size=batch_size)]
+    return [
+        [token.lemma_ for token in doc if keep_token(token.text)]
+        for doc in nlp.pipe((t.lower() for t in texts), batch_size=batch_size)
+    ]
+
+
+class SpacyWorkerPool:
+    """
+    Long-lived pool of spaCy worker processes, each loading the model once.
+
+    Unlike `nlp.pipe(..., n_process=n)`, which starts and tears down a new pool
+    for every call, the same workers serve every chunk of a column. `imap` streams
+    chunks with back-pressure: at most `max_pending` chunks are in flight, so the
+    producer never runs far ahead of the workers. With n_process <= 1 everything
+    runs in the current process.
+    """
+
+    def __init__(self, n_process: int = 4, batch_size: int = 2000, max_pending: int = None):
+        self.n_process = n_process
+        self.batch_size = batch_size
+        self.max_pending = max_pending or 2 * max(n_process, 1)
+        self.executor = None
+        if n_process > 1:
+            self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=n_process, initializer=get_nlp)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def _split(self, texts: List[str]) -> List[List[str]]:
+        size = max(1, -(-len(texts) // self.n_process))
+        return [texts[i:i + size] for i in range(0, len(texts), size)]
+
+    def lemmatize(self, texts: List[str], drop_stopwords: bool = False) -> List[List[str]]:
+        """Lemmatize one list of texts, spread over every worker."""
+        if self.executor is None or len(texts) < 2:
+            return _lemmatize_in_worker(texts, self.batch_size, drop_stopwords)
+        parts = self.executor.map(
+            _lemmatize_in_worker,
+            self._split(texts),
+            [self.batch_size] * self.n_process,
+            [drop_stopwords] * self.n_process
+        )
+        return [lemmas for part in parts for lemmas in part]
+
+    def imap(self, chunks: Iterable[List[str]], drop_stopwords: bool = False) -> Iterator[List[List[str]]]:
+        """Lemmatize a stream of chunks, yielding results in input order."""
+        if self.executor is None:
+            for chunk in chunks:
+                yield _lemmatize_in_worker(chunk, self.batch_size, drop_stopwords)
+            return
+
+        pending = deque()
+        for chunk in chunks:
+            pending.append(self.executor.submit(_lemmatize_in_worker, chunk, self.batch_size, drop_stopwords))
+            if len(pending) >= self.max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class VocabularyLemmatizer:
+    """
+    Lemmatize texts by table lookup, computing lemmas once per distinct token.
+
+    Documents are only tokenized (no tagger). The lemma table is filled from
+    documents that went through the full spaCy pipeline (the first
+    `calibration_size` documents seen) and, for tokens never observed there,
+    from lemmatizing the token alone. A token observed with more than one lemma
+    is context-dependent ("left", "saw", "found"...): documents containing such
+    a token go through the full pipeline, and their lemmas keep feeding the table.
+
+    One instance is meant to live for a whole column, so the table is shared by
+    every chunk. Full-pipeline documents are sent to `pool` (in-process by default).
+    With drop_stopwords, texts are lowercased and filtered with `keep_token` as in
+    `_lemmatize_in_worker`.
+    """
+
+    def __init__(
+        self,
+        calibration_size: int = 2000,
+        batch_size: int = 2000,
+        pool: SpacyWorkerPool = None,
+        drop_stopwords: bool = False
+    ):
+        self.calibration_size = calibration_size
+        self.batch_size = batch_size
+        self.drop_stopwords = drop_stopwords
+        self.pool = pool or SpacyWorkerPool(n_process=1, batch_size=batch_size)
+        self.observed = {}
+        self.ambiguous = set()
+        self.docs_seen = 0
+        self.docs_via_model = 0
+
+    def _observe(self, orth: str, lemma: str) -> None:
+        lemmas = self.observed.setdefault(orth, set())
+        lemmas.add(lemma)
+        if len(lemmas) > 1:
+            self.ambiguous.add(orth)
+
+    def _full(self, texts: List[str], tokenized: List[List[str]]) -> List[List[str]]:
+        results = self.pool.lemmatize(texts)
+        for orths, lemmas in zip(tokenized, results):
+            for orth, lemma in zip(orths, lemmas):
+                self._observe(orth, lemma)
+        self.docs_via_model += len(texts)
+        return results
+
+    def _learn_isolated(self, orths: List[str]) -> None:
+        """Lemmatize unseen tokens alone, one distinct token per document."""
+        for orth, doc in zip(orths, get_nlp().pipe(orths, batch_size=self.batch_size, n_process=1)):
+            if len(doc) == 1:
+                self._observe(orth, doc[0].lemma_)
+            else:
+                # The token is split differently on its own: let the model see it in context
+                self.observed.setdefault(orth, set())
+                self.ambiguous.add(orth)
+
+    def lemmatize_tokens(self, texts: List[str]) -> List[List[str]]:
+        """Return the list of token lemmas of each text."""
+        clean_texts = [(t if isinstance(t, str) else "") for t in texts]
+        if self.drop_stopwords:
+            clean_texts = [t.lower() for t in clean_texts]
+        tokenized = [[token.text for token in doc] for doc in get_nlp().tokenizer.pipe(clean_texts, batch_size=self.batch_size)]
+        results = [None] * len(clean_texts)
+
+        nb_calibration = max(0, min(self.calibration_size - self.docs_seen, len(clean_texts)))
+        self.docs_seen += len(clean_texts)
+        if nb_calibration:
+            results[:nb_calibration] = self._full(clean_texts[:nb_calibration], tokenized[:nb_calibration])
+
+        unseen = {orth for tokens in tokenized[nb_calibration:] for orth in tokens if orth not in self.observed}
+        if unseen:
+            self._learn_isolated(sorted(unseen))
+
+        to_model = []
+        for i in range(nb_calibration, len(clean_texts)):
+            if any(orth in self.ambiguous for orth in tokenized[i]):
+                to_model.append(i)
+            else:
+                results[i] = [next(iter(self.observed[orth])) for orth in tokenized[i]]
+
+        if to_model:
+            full = self._full([clean_texts[i] for i in to_model], [tokenized[i] for i in to_model])
+            for i, lemmas in zip(to_model, full):
+                results[i] = lemmas
+
+        if self.drop_stopwords:
+            results = [
+                [lemma for orth, lemma in zip(orths, lemmas) if keep_token(orth)]
+                for orths, lemmas in zip(tokenized, results)
+            ]
+        return results
+
+    def __call__(self, texts: List[str]) -> List[str]:
+        return [clean_lemmas(lemmas) for lemmas in self.lemmatize_tokens(texts)]
+
+
+def compare_lemmatization_modes(
+    texts: List[str],
+    sample_size: int = 2000,
+    calibration_size: int = 2000,
+    n_process: int = 1,
+    seed: int = 42
+) -> Dict[str, float]:
+    """
+    Measure the accuracy and speed of VocabularyLemmatizer against the full spaCy path.
+
+    A random sample of calibration_size texts calibrates the lemma table, then another
+    disjoint sample of sample_size texts is lemmatized by both paths and compared.
+
+    Returns:
+        Dict[str, float]: token and document agreement, share of documents that needed
+        the model, and the time spent by each path on the evaluation sample.
+    """
+    rng = random.Random(seed)
+    texts = [t for t in texts if isinstance(t, str)]
+    sample = rng.sample(texts, min(len(texts), sample_size + calibration_size))
+    calibration, evaluation = sample[:calibration_size], sample[calibration_size:]
+
+    with SpacyWorkerPool(n_process=n_process) as pool:
+        lemmatizer = VocabularyLemmatizer(calibration_size=len(calibration), pool=pool)
+        lemmatizer.lemmatize_tokens(calibration)
+        docs_via_model_before = lemmatizer.docs_via_model
+
+        start = time.perf_counter()
+        vocabulary = lemmatizer.lemmatize_tokens(evaluation)
+        vocabulary_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        full = pool.lemmatize(evaluation)
+        full_time = time.perf_counter() - start
+
+    nb_tokens = sum(len(lemmas) for lemmas in full)
+    same_tokens = sum(a == b for v, f in zip(vocabulary, full) for a, b in zip(v, f))
+    report = {
+        "documents": len(evaluation),
+        "token_accuracy": same_tokens / nb_tokens if nb_tokens else 1.0,
+        "document_accuracy": sum(v == f for v, f in zip(vocabulary, full)) / len(evaluation) if evaluation else 1.0,
+        "model_path_ratio": (lemmatizer.docs_via_model - docs_via_model_before) / len(evaluation) if evaluation else 0.0,
+        "ambiguous_tokens": len(lemmatizer.ambiguous),
+        "vocabulary_seconds": vocabulary_time,
+        "full_seconds": full_time
+    }
+    logger.info(
+        f"Vocabulary lemmatization: {report['token_accuracy']:.2%} token accuracy, "
+        f"{report['document_accuracy']:.2%} document accuracy, {report['model_path_ratio']:.1%} documents through the model, "
+        f"{report['vocabulary_seconds']:.2f}s vs {report['full_seconds']:.2f}s for the full spaCy path"
+    )
+    return report
+
+
+def spacy_model_key() -> str:
+    """
+    Identify the loaded spaCy pipeline (model name/version, enabled pipes, spaCy version).
+    Used to key every cached artifact derived from lemmatization.
+    """
+    import spacy
+    nlp = get_nlp()
+    meta = nlp.meta
+    return f"{meta['lang']}_{meta['name']}-{meta['version']}|{','.join(nlp.pipe_names)}|spacy-{spacy.__version__}"
+
+
 def lemmatize_column_fast(
     df: pl.DataFrame, 
     col_name: str, 
     new_col_name: str = None, 
     chunk_size: int = 5000, 
-    n_process: int = 4
+    n_process: int = 4,
+    cache_dir: str = None,
+    cache_size_limit: int = DEFAULT_SIZE_LIMIT,
+    mode: str = "full",
+    drop_stopwords: bool = False
 ) -> pl.DataFrame:
     """
     Lemmatize a Polars DataFrame column efficiently in batches with multiprocessing.
+
+    The whole column is streamed through one SpacyWorkerPool of n_process workers,
+    loaded once, instead of starting a new spaCy pool for every chunk. Progress is
+    still reported per chunk of chunk_size texts.
+
+    mode="full" runs every document through spaCy, mode="vocabulary" uses a
+    VocabularyLemmatizer shared by all chunks, so lemmas are computed once per distinct
+    token and only documents with context-dependent tokens go through the model
+    (see `compare_lemmatization_modes` for its accuracy on a sample).
+
+    With drop_stopwords=True, stopword removal is fused into the same pass: texts are
+    tokenized once by spaCy and the `remove_stopwords` filter is applied to its tokens,
+    so `remove_stopwords` does not need to run first. The source column is left untouched.
+
+    When cache_dir is given, lemmatized texts are stored in an on-disk LemmaCache keyed by
+    text hash and spaCy model: cached texts skip `nlp.pipe` entirely, only the misses of each
+    chunk are lemmatized. Hit/miss counters are logged at the end of the stage.
     """
     new_col_name = new_col_name or f"{col_name}_lemmatized"
     texts = df.select(col_name).to_series().to_list()
     lemmatized_chunks = []
+    if mode not in ("full", "vocabulary"):
+        raise ValueError(f"Unknown lemmatization mode: {mode}")
+    model_key = f"{spacy_model_key()}|{mode}" + ("|drop_stopwords" if drop_stopwords else "")
+    cache = LemmaCache(cache_dir, model_key, cache_size_limit) if cache_dir else None
+    pool = SpacyWorkerPool(n_process=n_process)
+    lemmatizer = VocabularyLemmatizer(pool=pool, drop_stopwords=drop_stopwords) if mode == "vocabulary" else None
+
+    # Chunks waiting for their lemmas: (texts, cached lemmas, distinct texts sent to spaCy)
+    pending = deque()
+
+    def jobs():
+        for i in range(0, len(texts), chunk_size):
+            chunk = [(t if isinstance(t, str) else "") for t in texts[i:i + chunk_size]]
+            cached = cache.get_many(chunk) if cache is not None else [None] * len(chunk)
+            missing = list(dict.fromkeys(t for t, lem in zip(chunk, cached) if lem is None))
+            pending.append((chunk, cached, missing))
+            yield missing
+
+    if lemmatizer is not None:
+        results = (lemmatizer(missing) for missing in jobs())
+    else:
+        results = ([clean_lemmas(lemmas) for lemmas in chunk_lemmas] for chunk_lemmas in pool.imap(jobs(), drop_stopwords))
 
-    for i in tqdm(range(0, len(texts), chunk_size), desc=f"Lemmatizing {col_name}"):
-        chunk = texts[i:i + chunk_size]
-        lemmatized_chunks.extend(lemmatize_and_clean_texts(chunk, n_process=n_process))
+    with pool:
+        for lemmatized in tqdm(results, total=-(-len(texts) // chunk_size), desc=f"Lemmatizing {col_name}"):
+            chunk, cached, missing = pending.popleft()
+            computed = dict(zip(missing, lemmatized))
+            if cache is not None:
+                cache.set_many(computed.items())
+            lemmatized_chunks.extend(lem if lem is not None else computed[t] for t, lem in zip(chunk, cached))
+
+    if lemmatizer is not None:
+        logger.info(
+            f"Vocabulary lemmatization: {len(lemmatizer.observed)} distinct tokens, "
+            f"{len(lemmatizer.ambiguous)} context-dependent, "
+            f"{lemmatizer.docs_via_model}/{lemmatizer.docs_seen} documents through the model"
+        )
+
+    if cache is not None:
+        stats = cache.stats()
+        logger.info(
+            f"Lemma cache: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['hit_rate']:.1%} hit rate, {stats['size_bytes'] / 2**20:.1f} MiB on disk)"
+        )
+        cache.close()
 
     return df.with_columns(pl.Series(name=new_col_name, values=lemmatized_chunks))
 
@@ -107,11 +465,258 @@ def lemmatize_categories(
         for category, keywords in categories.items()
     }
 
-import re
-import concurrent.futures
-from typing import Dict, List
-import polars as pl
-from tqdm import tqdm
+
+@lru_cache(maxsize=1)
+def _lemmatizer_inverse_tables() -> tuple:
+    """
+    Read the tables the spaCy lemmatizer derives lemmas from: the (surface suffix, lemma
+    suffix) rules, and the irregular surface -> lemma mappings (exceptions, lookup table,
+    attribute ruler), inverted to lemma -> surfaces.
+    """
+    nlp = get_nlp()
+    rules = set()
+    inverse = {}
+
+    def add_inverse(surface, lemmas):
+        for lemma in ([lemmas] if isinstance(lemmas, str) else lemmas):
+            inverse.setdefault(lemma.lower(), set()).add(surface.lower())
+
+    if "lemmatizer" in nlp.pipe_names:
+        lookups = nlp.get_pipe("lemmatizer").lookups
+        if lookups.has_table("lemma_rules"):
+            for pos_rules in lookups.get_table("lemma_rules").values():
+                rules.update((old, new) for old, new in pos_rules)
+        if lookups.has_table("lemma_exc"):
+            for pos_exc in lookups.get_table("lemma_exc").values():
+                for surface, lemmas in pos_exc.items():
+                    add_inverse(surface, lemmas)
+        if lookups.has_table("lemma_lookup"):
+            for surface, lemma in lookups.get_table("lemma_lookup").items():
+                if isinstance(surface, str):
+                    add_inverse(surface, lemma)
+
+    if "attribute_ruler" in nlp.pipe_names:
+        for rule in nlp.get_pipe("attribute_ruler").patterns:
+            lemma = rule.get("attrs", {}).get("LEMMA")
+            if not isinstance(lemma, str):
+                continue
+            for pattern in rule.get("patterns", []):
+                for token in pattern:
+                    for attr in ("ORTH", "LOWER", "TEXT"):
+                        if isinstance(token.get(attr), str):
+                            add_inverse(token[attr], lemma)
+
+    return frozenset(rules), inverse
+
+
+def lemma_surface_forms(lemma: str) -> set:
+    """
+    Every lowercase surface form the lemmatizer can turn into `lemma`: the lemma itself,
+    the inverse of each suffix rule and the irregular forms (e.g. child <- children).
+    """
+    rules, inverse = _lemmatizer_inverse_tables()
+    lemma = lemma.lower()
+    forms = {lemma} | inverse.get(lemma, set())
+    for old, new in rules:
+        if lemma.endswith(new) and len(lemma) > len(new):
+            forms.add(lemma[:len(lemma) - len(new)] + old)
+    return forms
+
+
+def prefilter_needles(categories: Dict[str, List[str]]) -> List[str]:
+    """
+    Substrings of which at least one must occur (lowercased) in a raw review for it to be
+    able to match any lemmatized keyword. For each keyword, its most selective token is
+    kept (the one whose shortest surface form is the longest) with all its surface forms.
+    Exclusions are ignored since they can only remove matches, so the set is conservative.
+    """
+    needles = set()
+    for keywords in categories.values():
+        for kw in keywords:
+            tokens = TOKEN_PATTERN.findall(normalize_keyword(kw).lower())
+            if not tokens:
+                continue
+            forms = max((lemma_surface_forms(token) for token in tokens), key=lambda f: min(map(len, f)))
+            needles.update(forms)
+
+    # A needle containing a shorter needle is redundant for a substring search
+    kept = []
+    for needle in sorted(needles, key=lambda n: (len(n), n)):
+        if not any(shorter in needle for shorter in kept):
+            kept.append(needle)
+    return sorted(kept)
+
+
+def prefilter_candidates(df: pl.DataFrame, column_name: str, needles: List[str]) -> pl.Series:
+    """
+    Flag the reviews containing at least one needle, with a single Aho-Corasick pass
+    (`str.contains_any`) over the lowercased raw text.
+    """
+    return df.select(
+        pl.col(column_name).str.to_lowercase().str.contains_any(needles).fill_null(False)
+    ).to_series()
+
+
+# Above this number of combinations, only the last token of a phrase is inflected
+MAX_PHRASE_VARIANTS = 256
+
+
+@lru_cache(maxsize=1)
+def _inflection_tables() -> Dict[str, tuple]:
+    """Per part of speech: the suffix rules and the known lemmas of the spaCy rule lemmatizer."""
+    nlp = get_nlp()
+    tables = {}
+    if "lemmatizer" not in nlp.pipe_names:
+        return tables
+    lookups = nlp.get_pipe("lemmatizer").lookups
+    if not (lookups.has_table("lemma_rules") and lookups.has_table("lemma_index")):
+        return tables
+    for pos in ("noun", "verb", "adj", "adv"):
+        rules = lookups.get_table("lemma_rules").get(pos)
+        if rules:
+            index = lookups.get_table("lemma_index").get(pos) or []
+            tables[pos] = ([tuple(rule) for rule in rules], frozenset(index))
+    return tables
+
+
+def inflected_forms(lemma: str) -> set:
+    """
+    Surface forms of a lemma: irregular forms from the lemmatizer tables, plus the inverse
+    suffix rules of every part of speech the lemma is known for (nouns when unknown).
+    Restricting rules to known parts of speech avoids forms like cat -> "cater".
+    """
+    tables = _inflection_tables()
+    _, inverse = _lemmatizer_inverse_tables()
+    lemma = lemma.lower()
+    forms = {lemma} | inverse.get(lemma, set())
+    parts_of_speech = [pos for pos, (_, index) in tables.items() if lemma in index]
+    if not parts_of_speech and "noun" in tables:
+        parts_of_speech = ["noun"]
+    for pos in parts_of_speech:
+        for old, new in tables[pos][0]:
+            if lemma.endswith(new) and len(lemma) > len(new):
+                forms.add(lemma[:len(lemma) - len(new)] + old)
+    return forms
+
+
+def inflect_phrase(phrase: str) -> List[str]:
+    """
+    Expand a lemmatized keyword or exclusion phrase into its inflected surface variants,
+    keeping the separators between tokens (dog-friendly -> dogs-friendly, ...).
+    """
+    phrase = normalize_keyword(phrase).lower()
+    matches = list(TOKEN_PATTERN.finditer(phrase))
+    if not matches:
+        return []
+    separators = [phrase[a.end():b.start()] for a, b in zip(matches, matches[1:])] + [""]
+    forms = [sorted(inflected_forms(m.group())) for m in matches]
+    if prod(len(f) for f in forms) > MAX_PHRASE_VARIANTS:
+        forms = [[m.group()] for m in matches[:-1]] + [forms[-1]]
+    return [
+        "".join(token + separator for token, separator in zip(tokens, separators))
+        for tokens in itertools.product(*forms)
+    ]
+
+
+def inflected_matcher(categories: Dict[str, List[str]], exclusions: Dict[str, List[str]]) -> KeywordMatcher:
+    """
+    Build a KeywordMatcher for raw (not lemmatized) text: every lemmatized keyword and
+    exclusion phrase is registered with all its inflected variants, and matches are
+    reported as the lemmatized keyword, like the lemmatized path.
+    """
+    phrases = {p for d in (categories, exclusions) for phrases in d.values() for p in phrases}
+    return KeywordMatcher(categories, exclusions, variants={p: inflect_phrase(p) for p in phrases})
+
+
+# Bump when the content or layout of the keyword artifact changes
+KEYWORD_ARTIFACT_VERSION = 3
+
+
+def keyword_artifact_key(categories_path: str, exclusions_path: str) -> str:
+    """
+    Hash the keyword and exclusion dictionaries together with the artifact version, the
+    spaCy / model package versions and the code building the artifact: the source of this
+    module (lemmatization, `inflected_forms`, `prefilter_needles`) and of the pickled
+    KeywordMatcher, with the name it is imported under ("keyword_matcher" /
+    "src.keyword_matcher"). Editing that code never loads a stale or unloadable artifact.
+    Package metadata is read without importing spaCy, so checking an existing artifact
+    stays cheap.
+    """
+    digest = hashlib.sha256(f"v{KEYWORD_ARTIFACT_VERSION}|{KeywordMatcher.__module__}".encode("utf-8"))
+    for source in (__file__, inspect.getfile(KeywordMatcher)):
+        with open(source, "rb") as f:
+            digest.update(b"|" + hashlib.sha256(f.read()).digest())
+    for package in ("spacy", SPACY_MODEL):
+        try:
+            digest.update(f"|{package}-{metadata.version(package)}".encode("utf-8"))
+        except metadata.PackageNotFoundError:
+            digest.update(f"|{package}-missing".encode("utf-8"))
+    for path in (categories_path, exclusions_path):
+        with open(path, "rb") as f:
+            digest.update(b"|" + f.read())
+    return digest.hexdigest()
+
+
+def compile_keyword_artifact(categories_path: str, exclusions_path: str) -> dict:
+    """
+    Compile the keyword dictionaries: lemmatize every keyword and exclusion phrase,
+    build the KeywordMatcher used by the "trie" engine, its inflection-expanded
+    counterpart for raw text and the prefilter needles.
+
+    Returns:
+        dict: {"key", "categories", "exclusions", "matcher", "inflected_matcher", "prefilter"}
+        where categories and exclusions hold the lemmatized phrases.
+    """
+    with open(categories_path, "r", encoding="utf-8") as f:
+        categories = json.load(f)
+    with open(exclusions_path, "r", encoding="utf-8") as f:
+        exclusions = json.load(f)
+
+    lemmatized_categories = lemmatize_categories(categories)
+    lemmatized_exclusions = lemmatize_categories(exclusions)
+    return {
+        "key": keyword_artifact_key(categories_path, exclusions_path),
+        "categories": lemmatized_categories,
+        "exclusions": lemmatized_exclusions,
+        "matcher": KeywordMatcher(lemmatized_categories, lemmatized_exclusions),
+        "inflected_matcher": inflected_matcher(lemmatized_categories, lemmatized_exclusions),
+        "prefilter": prefilter_needles(lemmatized_categories)
+    }
+
+
+def load_keyword_artifact(
+    categories_path: str = "../data/categories.json",
+    exclusions_path: str = "../data/exclusions.json",
+    artifact_dir: str = "../data/cache/keywords"
+) -> dict:
+    """
+    Load the compiled keyword artifact matching the current dictionaries, compiling and
+    saving it first if the dictionaries (or spaCy) changed since the last run.
+    See `compile_keyword_artifact` for the content.
+    """
+    key = keyword_artifact_key(categories_path, exclusions_path)
+    artifact_path = os.path.join(artifact_dir, f"keywords-{key[:16]}.pkl")
+
+    if os.path.exists(artifact_path):
+        try:
+            with open(artifact_path, "rb") as f:
+                artifact = pickle.load(f)
+        except (pickle.UnpicklingError, EOFError, ImportError, AttributeError, TypeError) as e:
+            # Truncated file, or pickled classes that cannot be found or rebuilt anymore
+            logger.warning(f"Keyword artifact {artifact_path} cannot be loaded ({type(e).__name__}: {e}), recompiling")
+            artifact = {}
+        if artifact.get("key") == key:
+            logger.info(f"Keyword artifact loaded from {artifact_path}")
+            return artifact
+
+    artifact = compile_keyword_artifact(categories_path, exclusions_path)
+    os.makedirs(artifact_dir, exist_ok=True)
+    tmp_path = f"{artifact_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, artifact_path)
+    logger.info(f"Keyword artifact compiled and saved to {artifact_path}")
+    return artifact
 
 def extract_all_categories(
     df: pl.DataFrame,
@@ -119,7 +724,12 @@ def extract_all_categories(
     categories: Dict[str, List[str]],
     exclusions: Dict[str, List[str]] = None,
     n_process: int = 4,
-    id_col: str = "id"
+    id_col: str = "id",
+    engine: str = "trie",
+    chunk_size: int = 20000,
+    matcher: KeywordMatcher = None,
+    index: InvertedIndex = None,
+    offsets: bool = False
 ) -> pl.DataFrame:
     """
     Extract reviews matching category keywords, keeping reviews if at least one keyword remains
@@ -130,18 +740,237 @@ def extract_all_categories(
         col_name (str): Column containing the text.
         categories (Dict[str, List[str]]): {category: [lemmatized keywords]}.
         exclusions (Dict[str, List[str]]): {category: [phrases to exclude]}.
-        n_process (int): Number of threads.
+        n_process (int): Number of worker processes for the "trie" engine (rows are sharded
+            across them), number of threads for the "regex" engine. Ignored by "polars".
         id_col (str): Column containing unique IDs.
+        engine (str): "trie" scans every review once with a precompiled KeywordMatcher,
+            "polars" runs the matching as native Polars expressions,
+            "index" only scans the candidate rows found in a prebuilt InvertedIndex,
+            "regex" is the historical per-category regex implementation.
+        chunk_size (int): Number of reviews per shard sent to a worker process.
+        matcher (KeywordMatcher): Prebuilt matcher for the "trie" engine, e.g. from
+            `load_keyword_artifact`. Built from categories and exclusions when omitted.
+        index (InvertedIndex): Index built from df[col_name], required by the "index" engine.
+        offsets (bool): Add a keyword_offsets column, after category so the positions of
+            the other columns do not change: the JSON list of the [start, end] character
+            offsets of the kept keyword occurrences in the review, e.g. for highlighting them. The "polars" engine computes them afterwards, on the
+            matching rows only, with a KeywordMatcher.
 
     Returns:
-        pl.DataFrame: DataFrame with columns [id, review, keywords_found, category].
+        pl.DataFrame: DataFrame with columns [id, review, keywords_found, category]
+        (+ keyword_offsets last).
     """
-
-    texts = df.select([id_col, col_name]).to_pandas()
     exclusions = exclusions or {}
 
-    def normalize_keyword(kw: str) -> str:
-        return kw.strip().replace(" - ", "-")
+    if engine == "polars":
+        df_filtered = _extract_with_polars(df, col_name, categories, exclusions, id_col)
+        if offsets:
+            matcher = matcher or KeywordMatcher(categories, exclusions)
+            df_filtered = df_filtered.with_columns(
+                pl.struct("review", "category").map_elements(
+                    lambda row: format_offsets(matcher.match_spans(row["review"]).get(row["category"], [])),
+                    return_dtype=pl.Utf8
+                ).alias("keyword_offsets")
+            )
+        logger.info(f"Extracted {df_filtered.shape[0]} matching reviews across {len(categories)} categories.")
+        return df_filtered
+
+    if engine == "trie":
+        matcher = matcher or KeywordMatcher(categories, exclusions)
+        all_results = _extract_with_matcher(df, col_name, matcher, id_col, n_process, chunk_size, offsets)
+    elif engine == "index":
+        if index is None or len(index) != df.height:
+            raise ValueError("The index engine needs an InvertedIndex built from the same rows as df")
+        matcher = matcher or KeywordMatcher(categories, exclusions)
+        per_category = {category: [] for category in matcher.categories}
+        for row, matched in index.extract(matcher, offsets).items():
+            for category, found in matched.items():
+                per_category[category].append(
+                    (index.ids[row], index.texts[row], *_format_match(matcher, category, found, offsets), category)
+                )
+        all_results = [result for results in per_category.values() for result in results]
+    elif engine == "regex":
+        all_results = _extract_with_regex(df, col_name, categories, exclusions, n_process, id_col, offsets)
+    else:
+        raise ValueError(f"Unknown extraction engine: {engine}")
+
+    if not all_results:
+        return pl.DataFrame(schema={
+            id_col: pl.Int64,
+            "review": pl.Utf8,
+            "keywords_found": pl.Utf8,
+            "category": pl.Utf8,
+            **({"keyword_offsets": pl.Utf8} if offsets else {})
+        })
+
+    df_filtered = pl.DataFrame({
+        id_col: [r[0] for r in all_results],
+        "review": [r[1] for r in all_results],
+        "keywords_found": [r[2] for r in all_results],
+        "category": [r[-1] for r in all_results],
+        **({"keyword_offsets": [r[3] for r in all_results]} if offsets else {})
+    })
+
+    logger.info(f"Extracted {df_filtered.shape[0]} matching reviews across {len(categories)} categories.")
+    return df_filtered
+
+# Matcher built once per worker process by `_init_matcher_worker`
+_worker_matcher = None
+
+def _init_matcher_worker(matcher: KeywordMatcher):
+    global _worker_matcher
+    _worker_matcher = matcher
+
+def format_offsets(spans: list) -> str:
+    """
+    Serialize (..., start, end) spans to the JSON list stored in the keyword_offsets column,
+    sorted and unique: equivalent spellings of a keyword ("wheel chair", "wheel-chair")
+    matching the same occurrence give a single offset, as with the "regex" engine.
+    """
+    return json.dumps([list(span) for span in sorted({(span[-2], span[-1]) for span in spans})])
+
+def _format_match(matcher: KeywordMatcher, category: str, found: list, offsets: bool) -> tuple:
+    """
+    (keywords_found,) from the output of `KeywordMatcher.match`, or (keywords_found,
+    keyword_offsets) from the output of `KeywordMatcher.match_spans`.
+    """
+    if not offsets:
+        return (", ".join(found),)
+    keywords = {kw for kw, _, _ in found}
+    # Same keyword order as KeywordMatcher.match
+    return ", ".join(kw for kw in matcher.categories[category] if kw in keywords), format_offsets(found)
+
+def _match_chunk(start: int, texts: List[str], offsets: bool = False) -> list:
+    """
+    Match one shard of reviews in a worker process.
+    Only (row index, category, keywords_found[, keyword_offsets]) is sent back, the texts
+    stay in the parent.
+    """
+    match = _worker_matcher.match_spans if offsets else _worker_matcher.match
+    results = []
+    for offset, text in enumerate(texts):
+        for category, found in match(text).items():
+            results.append((start + offset, category, *_format_match(_worker_matcher, category, found, offsets)))
+    return results
+
+def _extract_with_matcher(
+    df: pl.DataFrame,
+    col_name: str,
+    matcher: KeywordMatcher,
+    id_col: str,
+    n_process: int = 1,
+    chunk_size: int = 20000,
+    offsets: bool = False
+) -> list:
+    """
+    Single pass extraction: every review is tokenized and scanned once for all categories.
+
+    With n_process > 1 the rows are sharded into chunks of chunk_size reviews and matched
+    in a process pool, so throughput scales with CPU cores rather than with the number of
+    categories. Results are grouped by category (in categories.json order), then by row order.
+    """
+    ids = df[id_col].to_list()
+    texts = df[col_name].to_list()
+    starts = range(0, len(texts), chunk_size)
+
+    if n_process > 1 and len(starts) > 1:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=n_process,
+            initializer=_init_matcher_worker,
+            initargs=(matcher,)
+        ) as executor:
+            futures = [executor.submit(_match_chunk, i, texts[i:i + chunk_size], offsets) for i in starts]
+            # Shards are consumed in submission order, which keeps the row order
+            chunk_results = [fut.result() for fut in tqdm(futures, desc="Keyword extraction")]
+    else:
+        _init_matcher_worker(matcher)
+        chunk_results = [_match_chunk(i, texts[i:i + chunk_size], offsets) for i in tqdm(starts, desc="Keyword extraction")]
+
+    per_category = {category: [] for category in matcher.categories}
+    for results in chunk_results:
+        for row, category, *found in results:
+            per_category[category].append((ids[row], texts[row], *found, category))
+
+    return [result for results in per_category.values() for result in results]
+
+def _extract_with_polars(
+    df: pl.DataFrame,
+    col_name: str,
+    categories: Dict[str, List[str]],
+    exclusions: Dict[str, List[str]],
+    id_col: str
+) -> pl.DataFrame:
+    """
+    Vectorized extraction written as Polars expressions, so matching runs on Polars'
+    multithreaded engine directly on the Arrow buffers.
+
+    Per category, exclusion phrases are masked with `str.replace_all`, then every keyword
+    is tested with `str.contains` on the masked text. `str.contains_any` is used as a cheap
+    Aho-Corasick prefilter so the regex tests only run on rows holding a keyword substring.
+    """
+    text = pl.col("review")
+    frames = []
+
+    for category, keywords in categories.items():
+        patterns = [(kw, phrase_regex(kw)) for kw in keywords]
+        patterns = [(kw, pattern) for kw, pattern in patterns if pattern]
+        if not patterns:
+            continue
+
+        masked = text
+        for phrase in exclusions.get(category, []):
+            pattern = phrase_regex(phrase)
+            if pattern:
+                # The separator keeps the words around a masked phrase from forming a new keyword
+                masked = masked.str.replace_all(f"(?i){pattern}", " | ")
+
+        found = pl.concat_list([
+            pl.when(masked.str.contains(f"(?i){pattern}")).then(pl.lit(kw))
+            for kw, pattern in patterns
+        ]).list.drop_nulls()
+
+        needles = list({TOKEN_PATTERN.search(kw.lower()).group() for kw, _ in patterns})
+        frames.append(
+            df.lazy()
+            .select(pl.col(id_col), pl.col(col_name).alias("review"))
+            .filter(text.str.to_lowercase().str.contains_any(needles))
+            .select(
+                pl.col(id_col),
+                text,
+                found.list.join(", ").alias("keywords_found"),
+                pl.lit(category).alias("category")
+            )
+            .filter(pl.col("keywords_found") != "")
+        )
+
+    if not frames:
+        return pl.DataFrame(schema={
+            id_col: df.schema[id_col],
+            "review": pl.Utf8,
+            "keywords_found": pl.Utf8,
+            "category": pl.Utf8
+        })
+
+    return pl.concat(pl.collect_all(frames))
+
+def _extract_with_regex(
+    df: pl.DataFrame,
+    col_name: str,
+    categories: Dict[str, List[str]],
+    exclusions: Dict[str, List[str]],
+    n_process: int,
+    id_col: str,
+    offsets: bool = False
+) -> list:
+    """
+    Historical extraction: one regex search per keyword, exclusion, review and category.
+    Kept to compare results and speed against the other engines.
+
+    Exclusion matches are collected once per review as offset intervals and a keyword
+    occurrence only counts outside of them, instead of rewriting the review with one
+    `re.sub` per exclusion phrase.
+    """
+    texts = df.select([id_col, col_name]).to_pandas()
 
     def make_regex(kw: str) -> str:
         kw = normalize_keyword(kw)
@@ -151,6 +980,8 @@ def extract_all_categories(
             return r"\b" + re.escape(kw) + r"\b"
 
     def process_category(category: str, keywords: List[str], excluded_phrases: List[str]):
+        keyword_regexes = [(kw, re.compile(make_regex(kw), flags=re.IGNORECASE)) for kw in keywords]
+        exclusion_regexes = [re.compile(make_regex(ex), flags=re.IGNORECASE) for ex in excluded_phrases]
         results = []
         for _, row in texts.iterrows():
             text = row[col_name]
@@ -158,17 +989,20 @@ def extract_all_categories(
             if not isinstance(text, str):
                 continue
 
-            temp_text = text
-            # Temporarily remove the exclusion phrases
-            if excluded_phrases:
-                for ex in excluded_phrases:
-                    temp_text = re.sub(make_regex(ex), " ", temp_text, flags=re.IGNORECASE)
+            # Offsets of the exclusion phrases, the text itself is left untouched
+            excluded = merge_spans([m.span() for regex in exclusion_regexes for m in regex.finditer(text)])
 
-            # Check if at least one keyword remains
-            matched_keywords = [kw for kw in keywords if re.search(make_regex(kw), temp_text, flags=re.IGNORECASE)]
+            # Keep the keywords with at least one occurrence outside the excluded spans
+            matched_keywords, spans = [], []
+            for kw, regex in keyword_regexes:
+                kept = [m.span() for m in regex.finditer(text) if not overlaps(excluded, *m.span())]
+                if kept:
+                    matched_keywords.append(kw)
+                    spans.extend(kept)
 
             if matched_keywords:
-                results.append((review_id, text, ", ".join(matched_keywords), category))
+                found = (format_offsets(spans),) if offsets else ()
+                results.append((review_id, text, ", ".join(matched_keywords), *found, category))
 
         return results
 
@@ -180,60 +1014,203 @@ def extract_all_categories(
         for fut in tqdm(concurrent.futures.as_completed(futures), total=len(futures), desc="Keyword extraction"):
             all_results.extend(fut.result())
 
-    if not all_results:
-        return pl.DataFrame(schema={
-            id_col: pl.Int64,
-            "review": pl.Utf8,
-            "keywords_found": pl.Utf8,
-            "category": pl.Utf8
-        })
+    return all_results
 
-    df_filtered = pl.DataFrame({
-        id_col: [r[0] for r in all_results],
-        "review": [r[1] for r in all_results],
-        "keywords_found": [r[2] for r in all_results],
-        "category": [r[3] for r in all_results]
-    })
+def keywords_to_wide(
+    df_keywords: pl.DataFrame,
+    categories: List[str],
+    id_col: str = "id",
+    ids: pl.Series = None
+) -> pl.DataFrame:
+    """
+    Reshape the output of `extract_all_categories` to one row per review.
 
-    logger.info(f"Extracted {df_filtered.shape[0]} matching reviews across {len(categories)} categories.")
-    return df_filtered
+    Args:
+        df_keywords (pl.DataFrame): Long frame [id, review, keywords_found, category].
+        categories (List[str]): Category names, in output column order.
+        id_col (str): Column containing unique IDs.
+        ids (pl.Series): All review ids; when given, reviews without any match are kept
+            with every kw_<category> set to False.
+
+    Returns:
+        pl.DataFrame: [id, categories, kw_<category>..., keywords_<category>...] where
+        categories is a list of Enum (dictionary-encoded) categories, kw_<category> are
+        booleans and keywords_<category> lists of matched keywords. The review text is not
+        duplicated: it is referenced by id.
+    """
+    category_type = pl.Enum(list(categories))
+    wide = (
+        df_keywords.lazy()
+        .with_columns(
+            pl.col("keywords_found").str.split(", "),
+            pl.col("category").cast(category_type)
+        )
+        .group_by(id_col, maintain_order=True)
+        .agg(
+            [pl.col("category").alias("categories")]
+            + [
+                pl.col("keywords_found").filter(pl.col("category") == category).first().alias(f"keywords_{category}")
+                for category in categories
+            ]
+        )
+    )
+    if ids is not None:
+        wide = ids.rename(id_col).to_frame().lazy().join(wide, on=id_col, how="left", maintain_order="left")
 
-def process_pipeline(input_csv: str, column_name: str, output_csv: str, nb_process:int):
+    return wide.select(
+        pl.col(id_col),
+        pl.col("categories").fill_null(pl.lit([], dtype=pl.List(category_type))),
+        *[pl.col(f"keywords_{category}").is_not_null().alias(f"kw_{category}") for category in categories],
+        *[pl.col(f"keywords_{category}") for category in categories]
+    ).collect()
 
-    df = pl.read_csv(input_csv)
-    logger.info(f"DataFrame {os.path.splitext(os.path.basename(input_csv))[0]} loaded : {df.shape[0]} rows x {df.shape[1]} columns")
-    
-    # Load categories
-    with open("../data/categories.json", "r", encoding="utf-8") as f:
-        categories = json.load(f)
+def compare_matching_modes(
+    df: pl.DataFrame,
+    column_name: str,
+    keywords: dict = None,
+    n_process: int = 1,
+    id_col: str = "id"
+) -> Dict[str, object]:
+    """
+    Diff the lemmatization-free matching (inflected keywords on the raw text) against the
+    lemmatized path on a dataset, per (review, category, keyword).
 
-    # Load exclusions
-    with open("../data/exclusions.json", "r", encoding="utf-8") as f:
-        exclusions = json.load(f)
+    The lemmatized path is the reference: recall is the share of its matches also found on the
+    raw text, precision the share of raw text matches it confirms.
 
-    logger.info("Keywords and excluded words loaded")
+    Returns:
+        Dict[str, object]: global and per-category recall / precision, the time spent by each
+        path and the disagreeing matches as a DataFrame under "diff".
+    """
+    keywords = keywords or load_keyword_artifact()
 
-    df_clean = remove_stopwords(df, column_name)
-    logger.info("Stop words have been removed")
+    start = time.perf_counter()
+    df_lem = lemmatize_column_fast(df, column_name, n_process=n_process, drop_stopwords=True)
+    lemmatized = extract_all_categories(
+        df_lem, f"{column_name}_lemmatized", keywords["categories"], keywords["exclusions"],
+        n_process=n_process, id_col=id_col, matcher=keywords["matcher"]
+    )
+    lemmatized_time = time.perf_counter() - start
 
-    lemmatized_categories = lemmatize_categories(categories)
-    lemmatized_exclusions = lemmatize_categories(exclusions)
-    logger.info("Keywords and excluded words have been lemmatized")
+    start = time.perf_counter()
+    inflected = extract_all_categories(
+        df, column_name, keywords["categories"], keywords["exclusions"],
+        n_process=n_process, id_col=id_col, matcher=keywords["inflected_matcher"]
+    )
+    inflected_time = time.perf_counter() - start
+
+    def pairs(df_keywords: pl.DataFrame) -> pl.DataFrame:
+        return (
+            df_keywords.select(id_col, "category", pl.col("keywords_found").str.split(", ").alias("keyword"))
+            .explode("keyword")
+            .unique()
+        )
+
+    diff = (
+        pairs(lemmatized).with_columns(pl.lit(True).alias("lemmatized"))
+        .join(pairs(inflected).with_columns(pl.lit(True).alias("inflected")),
+              on=[id_col, "category", "keyword"], how="full", coalesce=True)
+        .with_columns(pl.col("lemmatized", "inflected").fill_null(False))
+    )
 
-    df_lem = lemmatize_column_fast(df_clean, column_name, n_process=nb_process)
-    logger.info("DataFrame has been lemmatized")
+    def scores(frame: pl.DataFrame) -> Dict[str, float]:
+        both = frame.filter(pl.col("lemmatized") & pl.col("inflected")).height
+        nb_lemmatized = frame["lemmatized"].sum()
+        nb_inflected = frame["inflected"].sum()
+        return {
+            "recall": both / nb_lemmatized if nb_lemmatized else 1.0,
+            "precision": both / nb_inflected if nb_inflected else 1.0
+        }
+
+    report = {
+        **scores(diff),
+        "categories": {
+            category: scores(diff.filter(pl.col("category") == category))
+            for category in keywords["categories"]
+        },
+        "lemmatized_seconds": lemmatized_time,
+        "inflected_seconds": inflected_time,
+        "diff": diff.filter(pl.col("lemmatized") != pl.col("inflected")).sort(id_col, "category", "keyword")
+    }
+    logger.info(
+        f"Inflection matching: {report['recall']:.2%} recall, {report['precision']:.2%} precision against "
+        f"the lemmatized path, {inflected_time:.2f}s vs {lemmatized_time:.2f}s "
+        f"({lemmatized_time / max(inflected_time, 1e-9):.1f}x speedup), {report['diff'].height} disagreements"
+    )
+    return report
+
+
+def process_pipeline(input_csv: str, column_name: str, output_csv: str, nb_process:int, engine: str = "trie",
+                     cache_dir: str = "../data/cache/lemmas", output_format: str = "csv", prefilter: bool = True,
+                     inflection: bool = False):
+    """
+    Run the keyword extraction pipeline on a CSV file.
+
+    With prefilter=True, only the reviews containing a surface form of some keyword (see
+    `prefilter_needles`) go through lemmatization and matching; the others cannot match.
+
+    With inflection=True, spaCy is skipped: the raw reviews are matched against the keywords
+    expanded to their inflected forms (see `inflected_matcher`), and the CSV output holds the
+    raw review. Use `compare_matching_modes` to measure what this costs on a dataset.
+
+    output_format="csv" writes one row per (review, category) match with the lemmatized review
+    and the offsets of the matched keywords in it (used by review_validation.py to highlight them),
+    output_format="parquet" writes one row per review id (see `keywords_to_wide`) as Parquet.
+    """
+
+    df = pl.read_csv(input_csv)
+    logger.info(f"DataFrame {os.path.splitext(os.path.basename(input_csv))[0]} loaded : {df.shape[0]} rows x {df.shape[1]} columns")
+    
+    # Load the compiled categories and exclusions (rebuilt only when the dictionaries change)
+    keywords = load_keyword_artifact()
+    logger.info("Lemmatized keywords and excluded words loaded")
+
+    df_candidates = df
+    if prefilter:
+        start = time.perf_counter()
+        df_candidates = df.filter(prefilter_candidates(df, column_name, keywords["prefilter"]))
+        prefilter_time = time.perf_counter() - start
+        logger.info(
+            f"Prefilter kept {df_candidates.height}/{df.height} reviews "
+            f"({df_candidates.height / max(df.height, 1):.1%} candidates) in {prefilter_time:.2f}s"
+        )
+
+    start = time.perf_counter()
+    if inflection:
+        if engine != "trie":
+            raise ValueError(f"Inflection matching requires the trie engine, got: {engine}")
+        df_match, match_column, matcher = df_candidates, column_name, keywords["inflected_matcher"]
+    else:
+        df_match = lemmatize_column_fast(df_candidates, column_name, n_process=nb_process, cache_dir=cache_dir, drop_stopwords=True)
+        match_column, matcher = f"{column_name}_lemmatized", keywords["matcher"]
+        logger.info("Stop words have been removed and DataFrame has been lemmatized")
 
     df_keywords = extract_all_categories(
-        df_lem, 
-        col_name = f"{column_name}_lemmatized",
-        categories=lemmatized_categories,
-        exclusions=lemmatized_exclusions,
-        n_process=nb_process
+        df_match, 
+        col_name = match_column,
+        categories=keywords["categories"],
+        exclusions=keywords["exclusions"],
+        n_process=nb_process,
+        engine=engine,
+        matcher=matcher,
+        offsets=output_format == "csv"
     )
     logger.info("Keywords extraction finished")
 
+    if prefilter and df_candidates.height:
+        # Estimated from the cost per candidate review of the stages the other reviews skipped
+        per_review = (time.perf_counter() - start) / df_candidates.height
+        saved = per_review * (df.height - df_candidates.height) - prefilter_time
+        logger.info(f"Prefilter saved about {saved:.1f}s of lemmatization and keyword matching")
+
     # Save
-    df_keywords.write_csv(output_csv)
+    if output_format == "parquet":
+        df_wide = keywords_to_wide(df_keywords, list(keywords["categories"]), ids=df["id"])
+        df_wide.write_parquet(output_csv)
+    elif output_format == "csv":
+        df_keywords.write_csv(output_csv)
+    else:
+        raise ValueError(f"Unknown output format: {output_format}")
     logger.info(f"DataFrame saved to {output_csv}")
 
 if __name__ == "__main__":
@@ -73,6 +73,8 @@ class ReviewValidator:
         self.review_text = tk.Text(self.text_frame, wrap=tk.WORD, height=20, 
                                     font=("Arial", 11))
         self.review_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        # Highlight of the matched keywords
+        self.review_text.tag_configure("keyword", background="yellow")
         
         # Scrollbar
         scrollbar = ttk.Scrollbar(self.text_frame, orient=tk.VERTICAL, 
@@ -361,6 +363,17 @@ class ReviewValidator:
         self.review_text.config(state=tk.NORMAL)
         self.review_text.delete(1.0, tk.END)
         self.review_text.insert(1.0, str(review))
+        self.highlight_keywords(original_index)
+    
+    def highlight_keywords(self, original_index):
+        # Offsets written by the keyword extraction pipeline, no regex is re-run here
+        if 'keyword_offsets' not in self.df.columns:
+            return
+        offsets = self.df.loc[original_index, 'keyword_offsets']
+        if not isinstance(offsets, str):
+            return
+        for start, end in json.loads(offsets):
+            self.review_text.tag_add("keyword", f"1.0 + {start} chars", f"1.0 + {end} chars")
     
     def validate_review(self):
         original_index = self.sample_indices[self.current_index]
@@ -0,0 +1,268 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import re
+from functools import lru_cache
+from importlib import metadata, resources
+from typing import Dict, FrozenSet, List, Tuple
+
+import polars as pl
+
+logger = logging.getLogger(__name__)
+
+# Bump when the content or layout of the spelling artifact changes
+SPELLING_ARTIFACT_VERSION = 1
+
+# English unigram / bigram frequency dictionaries shipped with symspellpy
+SPELLING_DICTIONARY = "frequency_dictionary_en_82_765.txt"
+SPELLING_BIGRAM_DICTIONARY = "frequency_bigramdictionary_en_243_342.txt"
+
+# Keyword dictionaries whose words are added to the vocabulary, so they are never "corrected"
+# and misspelled keywords ("wheelchiar") are corrected towards them
+VOCABULARY_PATHS = ("../data/categories.json", "../data/exclusions.json")
+
+# Words shorter than this are left untouched (too many close candidates)
+MIN_WORD_LENGTH = 3
+
+# Number of distinct words memoized by each process
+CORRECTION_CACHE_SIZE = 2 ** 16
+
+WORD_PATTERN = re.compile(r"[^\W\d_]+")
+
+# A word is a proper noun when at least this many of its occurrences not opening a text,
+# and at least this share of them, are capitalized
+PROPER_NOUN_MIN_COUNT = 2
+PROPER_NOUN_MIN_SHARE = 0.5
+
+
+def dictionary_path(name: str) -> str:
+    """Path of a dictionary shipped with symspellpy (read without importing it)."""
+    return str(resources.files("symspellpy") / name)
+
+
+def spelling_artifact_key(
+    dictionary: str,
+    bigram_dictionary: str,
+    vocabulary_paths: Tuple[str, ...],
+    max_edit_distance: int,
+    prefix_length: int
+) -> str:
+    """Hash the dictionaries, the keyword vocabulary, the SymSpell parameters and versions."""
+    digest = hashlib.sha256(
+        f"v{SPELLING_ARTIFACT_VERSION}|{max_edit_distance}|{prefix_length}".encode("utf-8")
+    )
+    try:
+        digest.update(f"|symspellpy-{metadata.version('symspellpy')}".encode("utf-8"))
+    except metadata.PackageNotFoundError:
+        digest.update(b"|symspellpy-missing")
+    for path in (dictionary, bigram_dictionary, *vocabulary_paths):
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                digest.update(b"|" + f.read())
+        else:
+            digest.update(f"|{path}-missing".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def keyword_vocabulary(vocabulary_paths: Tuple[str, ...]) -> List[str]:
+    """Lowercased words of every phrase of the keyword dictionaries (missing files are skipped)."""
+    words = set()
+    for path in vocabulary_paths:
+        if not os.path.exists(path):
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            for phrases in json.load(f).values():
+                for phrase in phrases:
+                    words.update(WORD_PATTERN.findall(phrase.lower()))
+    return sorted(words)
+
+
+def compile_spelling_artifact(
+    dictionary: str,
+    bigram_dictionary: str,
+    vocabulary_paths: Tuple[str, ...],
+    max_edit_distance: int,
+    prefix_length: int
+) -> dict:
+    """
+    Build the SymSpell index: the unigram dictionary with its precomputed deletes, the
+    bigram dictionary used by compound lookup, and the keyword vocabulary added with
+    the highest frequency of the dictionary.
+
+    Returns:
+        dict: {"key", "sym_spell"}
+    """
+    from symspellpy import SymSpell
+
+    sym_spell = SymSpell(max_dictionary_edit_distance=max_edit_distance, prefix_length=prefix_length)
+    if not sym_spell.load_dictionary(dictionary, term_index=0, count_index=1):
+        raise FileNotFoundError(f"Dictionary not found: {dictionary}")
+    if not sym_spell.load_bigram_dictionary(bigram_dictionary, term_index=0, count_index=2):
+        logger.warning(f"Bigram dictionary not found: {bigram_dictionary}, compound lookup without bigrams")
+    top_count = max(sym_spell.words.values())
+    for word in keyword_vocabulary(vocabulary_paths):
+        sym_spell.create_dictionary_entry(word, top_count)
+
+    return {
+        "key": spelling_artifact_key(dictionary, bigram_dictionary, vocabulary_paths, max_edit_distance, prefix_length),
+        "sym_spell": sym_spell
+    }
+
+
+def build_spelling_artifact(
+    dictionary: str = None,
+    bigram_dictionary: str = None,
+    vocabulary_paths: Tuple[str, ...] = VOCABULARY_PATHS,
+    max_edit_distance: int = 2,
+    prefix_length: int = 7,
+    artifact_dir: str = "../data/cache/spelling"
+) -> Tuple[str, str]:
+    """
+    Compile and save the SymSpell artifact unless the one matching the current
+    dictionaries already exists. See `compile_spelling_artifact` for the content.
+
+    Returns:
+        tuple[str, str]: Artifact path and key.
+    """
+    dictionary = dictionary or dictionary_path(SPELLING_DICTIONARY)
+    bigram_dictionary = bigram_dictionary or dictionary_path(SPELLING_BIGRAM_DICTIONARY)
+    key = spelling_artifact_key(dictionary, bigram_dictionary, vocabulary_paths, max_edit_distance, prefix_length)
+    artifact_path = os.path.join(artifact_dir, f"symspell-{key[:16]}.pkl")
+    if os.path.exists(artifact_path):
+        return artifact_path, key
+
+    artifact = compile_spelling_artifact(dictionary, bigram_dictionary, vocabulary_paths, max_edit_distance, prefix_length)
+    os.makedirs(artifact_dir, exist_ok=True)
+    tmp_path = f"{artifact_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, artifact_path)
+    logger.info(f"Spelling artifact compiled and saved to {artifact_path}")
+    return artifact_path, key
+
+
+def load_spelling_artifact(
+    dictionary: str = None,
+    bigram_dictionary: str = None,
+    vocabulary_paths: Tuple[str, ...] = VOCABULARY_PATHS,
+    max_edit_distance: int = 2,
+    prefix_length: int = 7,
+    artifact_dir: str = "../data/cache/spelling"
+) -> dict:
+    """
+    Load the compiled SymSpell artifact matching the current dictionaries, compiling it
+    first if they changed since the last run. Unpickling the index is about twice as
+    fast as rebuilding the deletes from the text dictionary.
+    """
+    args = (dictionary, bigram_dictionary, vocabulary_paths, max_edit_distance, prefix_length)
+    artifact_path, key = build_spelling_artifact(*args, artifact_dir=artifact_dir)
+    with open(artifact_path, "rb") as f:
+        artifact = pickle.load(f)
+    if artifact.get("key") != key:
+        os.remove(artifact_path)
+        artifact_path, key = build_spelling_artifact(*args, artifact_dir=artifact_dir)
+        with open(artifact_path, "rb") as f:
+            artifact = pickle.load(f)
+    return artifact
+
+
+def proper_nouns(
+    texts: pl.Series,
+    min_count: int = PROPER_NOUN_MIN_COUNT,
+    min_share: float = PROPER_NOUN_MIN_SHARE
+) -> FrozenSet[str]:
+    """
+    Lowercased words mostly written capitalized (not all upper-case) when they do not open
+    a text ("marriott", "paris"). Unlike the punctuation of the texts, which the cleaning
+    stages remove, this survives `remove_special_characters`: a misspelled word opening a
+    sentence ("Brekfast") is capitalized once, a name is capitalized wherever it appears.
+    """
+    words = (
+        texts.drop_nulls()
+        .str.extract_all(WORD_PATTERN.pattern)
+        .list.slice(1)
+        .explode()
+        .drop_nulls()
+    )
+    first = words.str.slice(0, 1)
+    counts = (
+        pl.DataFrame({
+            "word": words.str.to_lowercase(),
+            "capitalized": (first != first.str.to_lowercase()) & (words != words.str.to_uppercase())
+        })
+        .group_by("word")
+        .agg(pl.len().alias("count"), pl.col("capitalized").sum())
+        .filter((pl.col("capitalized") >= min_count) & (pl.col("capitalized") >= min_share * pl.col("count")))
+    )
+    return frozenset(counts["word"].to_list())
+
+
+class SpellingCorrector:
+    """
+    Word-level spelling correction with SymSpell compound lookup.
+
+    Only alphabetic words of at least MIN_WORD_LENGTH characters missing from the
+    vocabulary are looked up; compound lookup also splits run-together words
+    ("thehotel" -> "the hotel"). Corrections are memoized per word. Upper-case words
+    (acronyms, airport codes, brands) are never corrected. A corrected capitalized word
+    keeps its capital. Punctuation, digits and spacing are left as they are.
+
+    Capitalized words are kept when they are proper nouns. With the proper nouns of the
+    corpus (see `proper_nouns`), which works on texts stripped of their punctuation, those
+    are the only capitalized words kept. Without them, every capitalized word that does not
+    open the text or a sentence (after ".", "!" or "?") is taken for a proper noun.
+    """
+
+    def __init__(self, sym_spell, max_edit_distance: int = 2, proper_nouns: FrozenSet[str] = None):
+        self.sym_spell = sym_spell
+        self.words = sym_spell.words
+        self.max_edit_distance = max_edit_distance
+        self.proper_nouns = proper_nouns
+        self.corrected = 0
+        self.correct_word = lru_cache(maxsize=CORRECTION_CACHE_SIZE)(self._correct_word)
+
+    def _correct_word(self, word: str) -> str:
+        lowered = word.lower()
+        if len(word) < MIN_WORD_LENGTH or lowered in self.words:
+            return word
+        suggestions = self.sym_spell.lookup_compound(lowered, self.max_edit_distance)
+        if not suggestions or suggestions[0].term == lowered:
+            return word
+        correction = suggestions[0].term
+        if word[0].isupper():
+            return correction[0].upper() + correction[1:]
+        return correction
+
+    def _is_proper_noun(self, match: re.Match) -> bool:
+        """Upper-case word, or capitalized proper noun of the corpus (or not opening the text or a sentence)."""
+        word = match.group(0)
+        if word.isupper():
+            return True
+        if not word[0].isupper():
+            return False
+        if self.proper_nouns is not None:
+            return word.lower() in self.proper_nouns
+        text, i = match.string, match.start() - 1
+        while i >= 0 and text[i].isspace():
+            i -= 1
+        return i >= 0 and text[i] not in ".!?"
+
+    def _replace(self, match: re.Match) -> str:
+        word = match.group(0)
+        if self._is_proper_noun(match):
+            return word
+        correction = self.correct_word(word)
+        if correction != word:
+            self.corrected += 1
+        return correction
+
+    def correct(self, text: str) -> str:
+        if not isinstance(text, str):
+            return text
+        return WORD_PATTERN.sub(self._replace, text)
+
+    def cache_info(self) -> Dict[str, int]:
+        info = self.correct_word.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "corrected": self.corrected}
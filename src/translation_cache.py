@@ -0,0 +1,41 @@
+import re
+import unicodedata
+from typing import Iterable, List, Optional, Tuple
+
+try:
+    from .disk_cache import DEFAULT_SIZE_LIMIT, DiskCache
+except ImportError:
+    from disk_cache import DEFAULT_SIZE_LIMIT, DiskCache
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize a text before hashing: NFC Unicode form, whitespace runs collapsed, stripped."""
+    return WHITESPACE_PATTERN.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+class TranslationCache(DiskCache):
+    """
+    Persistent cache of translations, shared by every run and every dataset.
+
+    Entries are keyed by the normalized text together with the source language, the
+    target language and the translation backend, so the same review found in several
+    datasets is only translated once.
+    """
+
+    def __init__(self, directory: str, backend: str, target: str = "en", size_limit: int = DEFAULT_SIZE_LIMIT):
+        super().__init__(directory, "translation", size_limit)
+        self.backend = backend
+        self.target = target
+
+    def key(self, text: str, source: Optional[str]) -> str:
+        return self.digest(self.backend, source or "auto", self.target, normalize_text(text))
+
+    def get_many(self, items: List[Tuple[str, Optional[str]]]) -> List[Optional[str]]:
+        """Return the cached translation of each (text, source language), or None when it is missing."""
+        return self.get_keys([self.key(text, source) for text, source in items])
+
+    def set_many(self, items: Iterable[Tuple[str, Optional[str], str]]) -> None:
+        """Store (text, source language, translation) triples."""
+        self.set_keys((self.key(text, source), translation) for text, source, translation in items)
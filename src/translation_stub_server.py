@@ -0,0 +1,170 @@
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    from .async_translation import DEFAULT_CHAR_LIMIT, LIBRETRANSLATE_LANGUAGES
+except ImportError:
+    from async_translation import DEFAULT_CHAR_LIMIT, LIBRETRANSLATE_LANGUAGES
+
+logger = logging.getLogger(__name__)
+
+
+class StubTranslatorServer:
+    """
+    Local stand-in for a LibreTranslate-compatible /translate endpoint, to test and
+    benchmark the translation stage without network access or quotas.
+
+    Each text is "translated" to f"[{target}] {text}". The server can simulate the
+    behaviour of a real backend: a fixed latency plus a per-character cost, a rate
+    limit answered with 429 and Retry-After, random 503 failures and a character
+    limit per request answered with 413. GET /languages lists the supported languages,
+    a request with another source language is answered with 400 like LibreTranslate does.
+
+    Usage:
+        with StubTranslatorServer(rate_limit=20) as server:
+            client = AsyncTranslationClient(server.url)
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.05,
+        latency_per_char: float = 0.0,
+        rate_limit: float = None,
+        failure_rate: float = 0.0,
+        char_limit: int = DEFAULT_CHAR_LIMIT,
+        seed: int = 0,
+        languages: frozenset = LIBRETRANSLATE_LANGUAGES
+    ):
+        self.latency = latency
+        self.latency_per_char = latency_per_char
+        self.rate_limit = rate_limit
+        self.failure_rate = failure_rate
+        self.char_limit = char_limit
+        self.languages = languages
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.window = []
+        self.stats = {"requests": 0, "texts": 0, "characters": 0, "throttled": 0, "failed": 0}
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/translate"
+
+    def _throttled(self) -> bool:
+        """Sliding one second window of accepted requests."""
+        if self.rate_limit is None:
+            return False
+        now = time.monotonic()
+        self.window = [t for t in self.window if now - t < 1.0]
+        if len(self.window) >= self.rate_limit:
+            return True
+        self.window.append(now)
+        return False
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, status: int, body: dict, headers: dict = None):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path != "/languages":
+                    return self._reply(404, {"error": "Not found"})
+                self._reply(200, [{"code": code, "name": code} for code in sorted(server.languages)])
+
+            def do_POST(self):
+                if self.path != "/translate":
+                    return self._reply(404, {"error": "Not found"})
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                texts = payload.get("q", [])
+                single = isinstance(texts, str)
+                texts = [texts] if single else texts
+                characters = sum(len(text) for text in texts)
+
+                with server.lock:
+                    server.stats["requests"] += 1
+                    if server._throttled():
+                        server.stats["throttled"] += 1
+                        return self._reply(429, {"error": "Too many requests"}, {"Retry-After": "1"})
+                    if server.random.random() < server.failure_rate:
+                        server.stats["failed"] += 1
+                        return self._reply(503, {"error": "Service unavailable"})
+                    server.stats["texts"] += len(texts)
+                    server.stats["characters"] += characters
+
+                source = payload.get("source", "auto")
+                if source != "auto" and source not in server.languages:
+                    return self._reply(400, {"error": f"{source} is not supported"})
+                if characters > server.char_limit:
+                    return self._reply(413, {"error": f"Request exceeds {server.char_limit} characters"})
+
+                time.sleep(server.latency + server.latency_per_char * characters)
+                target = payload.get("target", "en")
+                translations = [f"[{target}] {text}" for text in texts]
+                self._reply(200, {"translatedText": translations[0] if single else translations})
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        return Handler
+
+    def start(self) -> "StubTranslatorServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "StubTranslatorServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    parser = argparse.ArgumentParser(prog="translation_stub_server.py",
+                                     description="Local stand-in translator server (LibreTranslate-compatible /translate)",
+                                     epilog="Exemple : python translation_stub_server.py --port 5000 --rate_limit 10 --failure_rate 0.05")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Interface to listen on.")
+    parser.add_argument("--port", type=int, default=5000, help="Port to listen on.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fixed latency per request, in seconds.")
+    parser.add_argument("--latency_per_char", type=float, default=0.0, help="Additional latency per character, in seconds.")
+    parser.add_argument("--rate_limit", type=float, default=None, help="Requests accepted per second, 429 above.")
+    parser.add_argument("--failure_rate", type=float, default=0.0, help="Share of requests answered with 503.")
+    parser.add_argument("--char_limit", type=int, default=DEFAULT_CHAR_LIMIT, help="Characters accepted per request, 413 above.")
+    args = parser.parse_args()
+
+    server = StubTranslatorServer(args.host, args.port, args.latency, args.latency_per_char,
+                                  args.rate_limit, args.failure_rate, args.char_limit)
+    logger.info(f"Stub translator listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,22 @@
+import json
+
+import polars as pl
+import pytest
+
+from keyword_index import InvertedIndex
+from pipeline_extraction_keywords import extract_all_categories
+
+CATEGORIES = {"handicap": ["wheel chair", "wheel-chair", "wheel"]}
+
+
+@pytest.mark.parametrize("engine", ["trie", "regex", "polars", "index"])
+def test_spellings_of_the_same_occurrence_give_one_offset(engine):
+    df = pl.DataFrame({"id": [1], "review": ["I came with my wheel chair."]})
+    index = InvertedIndex.build(df, "review") if engine == "index" else None
+
+    df_keywords = extract_all_categories(
+        df, "review", CATEGORIES, {}, n_process=1, engine=engine, index=index, offsets=True
+    )
+
+    assert df_keywords["keywords_found"].to_list() == ["wheel chair, wheel-chair, wheel"]
+    assert json.loads(df_keywords["keyword_offsets"][0]) == [[15, 20], [15, 26]]
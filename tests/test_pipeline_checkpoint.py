@@ -0,0 +1,63 @@
+import polars as pl
+
+from pipeline_anomalies_processing import translation_complete
+from pipeline_checkpoint import StageCheckpoints
+
+
+class FlakyTranslator:
+    """Translates by upper-casing, failing every row of the batches holding a text in `down`."""
+
+    def __init__(self, down=()):
+        self.down = set(down)
+        self.calls = []
+
+    def __call__(self, df):
+        self.calls.append(df["review"].to_list())
+        failed = any(text in self.down for text in df["review"])
+        return df.with_columns(
+            pl.col("review") if failed else pl.col("review").str.to_uppercase(),
+            pl.lit("failed" if failed else "translated").alias("translation_status")
+        ), 0 if failed else df.height
+
+
+def run_pipeline(tmp_path, translator, tail_calls):
+    input_csv = tmp_path / "reviews.csv"
+    checkpoints = StageCheckpoints(str(tmp_path / "checkpoints"), str(input_csv))
+    df = pl.read_csv(input_csv)
+    df, nb_translated = checkpoints.run_batched(
+        "translation", {"backend": "stub"}, translator, df, batch_rows=2, complete=translation_complete
+    )
+
+    def tail(df):
+        tail_calls.append(df.height)
+        return df, None
+
+    df, _ = checkpoints.run("tail", {}, tail, df)
+    return df, nb_translated
+
+
+def test_failed_batches_are_translated_again_on_resume(tmp_path):
+    pl.DataFrame({"review": ["a", "b", "c", "d", "e"]}).write_csv(tmp_path / "reviews.csv")
+    tail_calls = []
+
+    # The translator is down for the second batch
+    outage = FlakyTranslator(down={"c"})
+    df, nb_translated = run_pipeline(tmp_path, outage, tail_calls)
+    assert df["review"].to_list() == ["A", "B", "c", "d", "E"]
+    assert nb_translated == 3
+
+    # Only the failed batch is sent again, and the next stage now runs on its translation
+    recovered = FlakyTranslator()
+    df, nb_translated = run_pipeline(tmp_path, recovered, tail_calls)
+    assert recovered.calls == [["c", "d"]]
+    assert df["review"].to_list() == ["A", "B", "C", "D", "E"]
+    assert (df["translation_status"] == "translated").all()
+    assert nb_translated == 5
+    assert tail_calls == [5, 5]
+
+    # Every stage is restored from its checkpoint
+    restored = FlakyTranslator()
+    df, _ = run_pipeline(tmp_path, restored, tail_calls)
+    assert restored.calls == []
+    assert tail_calls == [5, 5]
+    assert df["review"].to_list() == ["A", "B", "C", "D", "E"]
@@ -0,0 +1,58 @@
+import polars as pl
+import pytest
+
+from pipeline_anomalies_processing import remove_special_characters
+from spelling_correction import SpellingCorrector, proper_nouns
+
+pytest.importorskip("symspellpy")
+from symspellpy import SymSpell
+
+DICTIONARY = (
+    "the breakfast was great and staff were friendly we stayed at near station "
+    "room clean would come back again in it"
+).split()
+
+REVIEWS = [
+    "We stayed at the Marriott near the station. Brekfast was great!",
+    "The Marriott staff were friendly. Rooom was clean, we would come back.",
+    "Great stay in Paris. The staff were friendly, we would come back to Paris.",
+    "Paris again! We stayed at the Marriott, it was clean.",
+]
+
+
+@pytest.fixture(scope="module")
+def sym_spell():
+    sym_spell = SymSpell(max_dictionary_edit_distance=2, prefix_length=7)
+    for word in DICTIONARY:
+        sym_spell.create_dictionary_entry(word, 1000)
+    return sym_spell
+
+
+@pytest.fixture(scope="module")
+def cleaned():
+    # The texts as the spelling stage gets them in preprocess_pipeline: punctuation removed
+    return remove_special_characters(pl.DataFrame({"review": REVIEWS}), "review")["review"]
+
+
+def test_proper_nouns_survive_the_cleaning(cleaned):
+    assert "." not in cleaned[0]
+    assert proper_nouns(cleaned) == {"marriott", "paris"}
+
+
+def test_capitalized_words_are_corrected_in_cleaned_text(sym_spell, cleaned):
+    corrector = SpellingCorrector(sym_spell, proper_nouns=proper_nouns(cleaned))
+
+    assert corrector.correct(cleaned[0]) == "We stayed at the Marriott near the station Breakfast was great"
+    assert corrector.correct(cleaned[1]) == "The Marriott staff were friendly Room was clean we would come back"
+    assert corrector.correct(cleaned[3]) == "Paris again We stayed at the Marriott it was clean"
+
+
+def test_acronyms_are_never_corrected(sym_spell, cleaned):
+    corrector = SpellingCorrector(sym_spell, proper_nouns=proper_nouns(cleaned))
+    assert corrector.correct("BRKFST was great") == "BRKFST was great"
+
+
+def test_punctuation_rule_without_corpus(sym_spell):
+    corrector = SpellingCorrector(sym_spell)
+    assert corrector.correct("Brekfast was great. Rooom was clean") == "Breakfast was great. Room was clean"
+    assert corrector.correct("we stayed at Marriot") == "we stayed at Marriot"
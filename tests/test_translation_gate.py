@@ -0,0 +1,26 @@
+import pytest
+
+from pipeline_anomalies_processing import translation_skip_reason
+
+
+@pytest.mark.parametrize("text, confidence", [
+    ("Ottimo", 0.26),
+    ("Bom hotel, recomendo", 0.30),
+    ("rien a dire", 0.37),
+    ("Sehr gut", 0.41),
+    ("Muy limpio y bonito", None),
+])
+def test_short_foreign_ascii_reviews_are_translated(text, confidence):
+    assert translation_skip_reason(text, confidence) is None
+
+
+@pytest.mark.parametrize("text, confidence, reason", [
+    ("The room was clean and the staff were very friendly", 0.3, "english_stopwords"),
+    ("very clean", 0.8, "short_text"),
+])
+def test_english_reviews_are_skipped(text, confidence, reason):
+    assert translation_skip_reason(text, confidence) == reason
+
+
+def test_non_ascii_reviews_are_always_translated():
+    assert translation_skip_reason("très propre and the staff", 0.1) is None